@@ -0,0 +1,242 @@
+# benchmark.py
+# ------------
+# Performance checks for the search data structures and algorithms.
+#
+# Usage:
+#   python benchmark.py queue
+#   python benchmark.py corpus
+#   python benchmark.py search [--repetitions 5] [--save baseline.json] [--baseline baseline.json]
+
+
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import statistics
+import tracemalloc
+import util
+import eightpuzzle
+
+
+CORPUS_FILE = "benchmark_corpus.jsonl"
+CORPUS_SEED = 8
+CORPUS_PER_DEPTH = 3
+
+SEARCH_PAIRS = [    # (algorithm, heuristic name, deepest corpus puzzle it is run on)
+    ("BFS", None, None),
+    ("DFS", None, 8),       # Explores most of the state space at any depth
+    ("UCS", None, None),
+    ("IDDFS", None, 12),
+    ("BiBFS", None, None),
+    ("GBS", "manhattan", None),
+    ("A*", "misplaced", None),
+    ("A*", "manhattan", None),
+    ("A*", "linear", None),
+    ("A*", "walking", None),
+    ("A*", "pdb", None),
+    ("A*", "exact", None),
+    ("IDA*", "manhattan", None),
+    ("IDA*", "linear", None),
+    ("BiA*", "manhattan", None),
+]
+
+
+def queueBenchmark(sizes=(1000, 10000, 100000, 200000), operations=100000):
+    """
+    Measures util.Queue push/pop throughput while the queue holds a frontier
+    of each given size, the way BFS uses it: every pop is followed by a push,
+    so the size stays constant.  Returns a list of (size, ns per push/pop pair).
+    """
+    results = []
+    for size in sizes:
+        frontier = util.Queue()
+        for item in range(size):
+            frontier.push(item)
+        startTime = time.perf_counter_ns()
+        for item in range(operations):
+            frontier.push(frontier.pop())
+        elapsed = time.perf_counter_ns() - startTime
+        results.append((size, elapsed / operations))
+    return results
+
+
+def printQueueBenchmark(args):
+    print("Frontier Size | ns per push/pop")
+    print("-------------------------------")
+    for size, nanoseconds in queueBenchmark():
+        print(f"{size:<13} | {nanoseconds:.1f}")
+
+
+def depthLayers(goal=eightpuzzle.GOAL_NUMBERS):
+    """
+    Runs a breadth-first search from goal over the whole 8-puzzle state
+    space and returns the list of states at every optimal depth.
+    """
+    start = eightpuzzle.EightPuzzleState(goal)
+    seen = {start}
+    layers = [[start]]
+    while True:
+        nextLayer = []
+        for state in layers[-1]:
+            for move, child in state.successors():
+                if child not in seen:
+                    seen.add(child)
+                    nextLayer.append(child)
+        if not nextLayer:
+            return layers
+        layers.append(nextLayer)
+
+
+def buildCorpus(seed=CORPUS_SEED, perDepth=CORPUS_PER_DEPTH, goal=eightpuzzle.GOAL_NUMBERS):
+    """
+    Returns the benchmark corpus: perDepth puzzles drawn with a seeded
+    generator from every optimal depth the goal has (0 to 30 for the
+    default goal), as batch records with their "depth".
+    """
+    generator = random.Random(seed)
+    corpus = []
+    for depth, layer in enumerate(depthLayers(goal)):
+        layer.sort(key=lambda state: state.packed)
+        for state in generator.sample(layer, min(perDepth, len(layer))):
+            corpus.append({"initial": state.numbers(), "goal": list(goal), "depth": depth})
+    return corpus
+
+
+def writeCorpus(args):
+    corpus = buildCorpus()
+    with open(args.corpus, "w") as file:
+        for record in corpus:
+            file.write(json.dumps(record) + "\n")
+    print(f"Wrote {len(corpus)} puzzles to {args.corpus}")
+
+
+def readCorpus(corpusFile, maxDepth=None):
+    with open(corpusFile) as file:
+        corpus = [json.loads(line) for line in file if line.strip()]
+    return [record for record in corpus if maxDepth is None or record["depth"] <= maxDepth]
+
+
+def percentile(values, fraction):
+    "Nearest-rank percentile of values"
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def benchmarkPair(algorithm, heuristicName, corpus, repetitions):
+    """
+    Solves every corpus puzzle repetitions times with one algorithm and
+    heuristic, timed with perf_counter_ns, plus one extra run under
+    tracemalloc for the peak memory.  Returns the summary record.
+    """
+    latencies = []      # Median time of every puzzle, in ns
+    nodesExpanded = 0
+    peakMemory = 0
+    for record in corpus:
+        heuristic = eightpuzzle.cachedHeuristic(heuristicName, record["goal"])
+        problem = eightpuzzle.EightPuzzleSearchProblem(eightpuzzle.puzzleState(record["initial"]),
+                                                       eightpuzzle.puzzleState(record["goal"]))
+        if heuristic is not None:
+            heuristic(problem.getStartState(), problem)     # Loads lazily built tables before timing
+        times = []
+        for repetition in range(repetitions):
+            startTime = time.perf_counter_ns()
+            actions, expanded, path, depth = eightpuzzle.searchResult(algorithm, problem, heuristic)
+            times.append(time.perf_counter_ns() - startTime)
+        latencies.append(statistics.median(times))
+        nodesExpanded += expanded
+
+        tracemalloc.start()
+        eightpuzzle.searchResult(algorithm, problem, heuristic)
+        peakMemory = max(peakMemory, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    totalTime = sum(latencies)
+    return {
+        "puzzles": len(corpus),
+        "nodesExpanded": nodesExpanded,
+        "nodesPerSec": nodesExpanded / (totalTime / 1e9) if totalTime else 0.0,
+        "totalMs": totalTime / 1e6,
+        "medianMs": statistics.median(latencies) / 1e6,
+        "p95Ms": percentile(latencies, 0.95) / 1e6,
+        "peakMemoryKiB": peakMemory / 1024,
+    }
+
+
+def pairName(algorithm, heuristicName):
+    return f"{algorithm}/{heuristicName}" if heuristicName else algorithm
+
+
+def compareBaseline(results, baseline, tolerance):
+    """
+    Returns the list of regression messages of results against baseline:
+    more nodes expanded, or a total corpus time or peak memory more than
+    tolerance (a fraction) above the baseline value.  Time is compared as
+    the sum of the per-puzzle medians: the median and p95 of single
+    sub-millisecond puzzles are reported, but vary too much run to run to
+    gate on.
+    """
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if previous is None or previous["puzzles"] != result["puzzles"]:
+            continue
+        if result["nodesExpanded"] > previous["nodesExpanded"]:
+            regressions.append(f"{name}: nodes expanded {previous['nodesExpanded']} -> {result['nodesExpanded']}")
+        for key in ("totalMs", "peakMemoryKiB"):
+            if key in previous and result[key] > previous[key] * (1 + tolerance):
+                regressions.append(f"{name}: {key} {previous[key]:.3f} -> {result[key]:.3f}")
+    return regressions
+
+
+def runSearchBenchmark(args):
+    corpus = readCorpus(args.corpus, args.max_depth)
+    pairs = [pair for pair in SEARCH_PAIRS if not args.pairs or pairName(pair[0], pair[1]) in args.pairs]
+    results = {}
+    print("Algorithm/Heuristic | Puzzles | Nodes/sec  | Total ms   | Median ms  | p95 ms     | Peak KiB")
+    print("--------------------------------------------------------------------------------------------")
+    for algorithm, heuristicName, maxDepth in pairs:
+        puzzles = [record for record in corpus if maxDepth is None or record["depth"] <= maxDepth]
+        name = pairName(algorithm, heuristicName)
+        result = benchmarkPair(algorithm, heuristicName, puzzles, args.repetitions)
+        results[name] = result
+        print(f"{name:<19} | {result['puzzles']:<7} | {result['nodesPerSec']:<10.0f} | "
+              f"{result['totalMs']:<10.3f} | {result['medianMs']:<10.3f} | {result['p95Ms']:<10.3f} | {result['peakMemoryKiB']:.1f}")
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump({"corpus": args.corpus, "repetitions": args.repetitions,
+                       "python": sys.version.split()[0], "results": results}, file, indent=2)
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compareBaseline(results, json.load(file), args.tolerance)
+        for message in regressions:
+            print("REGRESSION " + message)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    benchmarks = {"queue": printQueueBenchmark, "corpus": writeCorpus, "search": runSearchBenchmark}
+    parser = argparse.ArgumentParser(description="Benchmarks for the search data structures and algorithms")
+    parser.add_argument("names", nargs="*", metavar="name",
+                        help="Benchmarks to run: " + ", ".join(benchmarks) + " (default: queue and search)")
+    parser.add_argument("--corpus", default=CORPUS_FILE,
+                        help="JSONL corpus of puzzles with their optimal depth")
+    parser.add_argument("--repetitions", type=int, default=5,
+                        help="Timed runs per puzzle; the median is kept")
+    parser.add_argument("--max-depth", type=int,
+                        help="Only benchmark corpus puzzles up to this optimal depth")
+    parser.add_argument("--pairs", nargs="*",
+                        help="Only these algorithm/heuristic pairs, e.g. A*/manhattan BFS")
+    parser.add_argument("--save", help="Write the results as a JSON baseline to this file")
+    parser.add_argument("--baseline", help="Compare against this JSON baseline and exit 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed relative slowdown or memory growth before flagging a regression")
+    args = parser.parse_args()
+    for name in args.names:
+        if name not in benchmarks:
+            parser.error(f"unknown benchmark {name!r}")
+    for name in args.names or ["queue", "search"]:
+        benchmarks[name](args)
@@ -12,29 +12,196 @@
 # Pieter Abbeel (pabbeel@cs.berkeley.edu).
 
 
+import os
+import sys
+import csv
+import json
+import math
+import mmap
+import tempfile
 import time
 import argparse
 import search
 import itertools
+import collections
+import concurrent.futures
 
 # Module Classes
 
-class EightPuzzleState:
+# Board geometry.  Each tile is packed into 4 bits of a single integer,
+# cell i (row-major) living at bits 4*i .. 4*i+3, so a state is one small int.
+PUZZLE_SIZE = 3
+PUZZLE_CELLS = PUZZLE_SIZE * PUZZLE_SIZE
+GOAL_NUMBERS = [1, 2, 3, 8, 0, 4, 7, 6, 5]
+
+
+def packNumbers(numbers):
     """
-    The Eight Puzzle is described in the course textbook on
-    page 64.
+    Packs a flat list of tiles into the 4-bits-per-tile integer encoding.
+    """
+    packed = 0
+    for index, tile in enumerate(numbers):
+        packed |= tile << (4 * index)
+    return packed
 
-    This class defines the mechanics of the puzzle itself.  The
-    task of recasting this puzzle as a search problem is left to
-    the EightPuzzleSearchProblem class.
+
+def unpackNumbers(packed, cells=PUZZLE_CELLS):
+    """
+    Inverse of packNumbers: the flat row-major list of the cells tiles.
     """
+    return [(packed >> (4 * index)) & 0xF for index in range(cells)]
+
+
+def permutationRank(numbers):
+    """
+    Returns the lexicographic rank (Lehmer code) of a permutation of
+    0 .. n-1, a dense index in [0, n!).
+
+    The number of later values smaller than value is value minus the
+    number of earlier ones, read off a bitmask of the values seen so far,
+    so the rank takes O(n) steps.
+
+    >>> permutationRank([0, 1, 2]), permutationRank([2, 1, 0])
+    (0, 5)
+    """
+    rank = 0
+    seen = 0
+    count = len(numbers)
+    for index, value in enumerate(numbers):
+        smaller = value - (seen & ((1 << value) - 1)).bit_count()
+        rank = rank * (count - index) + smaller
+        seen |= 1 << value
+    return rank
+
+
+def permutationUnrank(rank, count):
+    """
+    Inverse of permutationRank: returns the permutation of 0 .. count-1
+    with the given lexicographic rank.
+
+    >>> permutationUnrank(5, 3)
+    [2, 1, 0]
+    """
+    digits = []
+    for radix in range(1, count + 1):
+        rank, digit = divmod(rank, radix)
+        digits.append(digit)
+    unused = list(range(count))
+    return [unused.pop(digit) for digit in reversed(digits)]
+
+
+def placementRank(positions, count):
+    """
+    Returns the rank of an ordered placement of k distinct cells drawn from
+    0 .. count-1, a dense index in [0, count! / (count-k)!).  A full
+    placement ranks like permutationRank, and appending one more cell
+    maps rank r to r * (count-k) plus the new cell's rank among the free ones.
+
+    >>> placementRank([2, 1, 0], 3) == permutationRank([2, 1, 0])
+    True
+    >>> placementRank([8, 7], 9)
+    71
+    """
+    rank = 0
+    seen = 0
+    for index, position in enumerate(positions):
+        smaller = position - (seen & ((1 << position) - 1)).bit_count()
+        rank = rank * (count - index) + smaller
+        seen |= 1 << position
+    return rank
+
+
+def isSolvable(initial, goal):
+    """
+    Returns True if the flat board initial can reach the flat board goal.
+
+    Every move swaps the blank with a neighbour, so it flips the parity of
+    the permutation taking goal to initial and moves the blank by one cell.
+    The goal is reachable exactly when the permutation parity equals the
+    parity of the blank's Manhattan distance between the two boards.  The
+    parity comes from a cycle count, so the check is O(n) for any width.
+
+    >>> isSolvable([1, 2, 3, 8, 0, 4, 7, 6, 5], GOAL_NUMBERS)
+    True
+    >>> isSolvable([2, 1, 3, 8, 0, 4, 7, 6, 5], GOAL_NUMBERS)
+    False
+    """
+    count = len(initial)
+    size = math.isqrt(count)
+    goalPositions = [0] * count
+    for position, tile in enumerate(goal):
+        goalPositions[tile] = position
+    permutation = [goalPositions[tile] for tile in initial]
+
+    visited = [False] * count
+    cycles = 0
+    for start in range(count):
+        if not visited[start]:
+            cycles += 1
+            position = start
+            while not visited[position]:
+                visited[position] = True
+                position = permutation[position]
+
+    blankRow, blankCol = divmod(initial.index(0), size)
+    goalRow, goalCol = divmod(goal.index(0), size)
+    blankDistance = abs(blankRow - goalRow) + abs(blankCol - goalCol)
+    return (count - cycles) % 2 == blankDistance % 2
+
+
+def buildMoveTable(size):
+    """
+    Precomputes, for every blank position, the legal (move, newBlank) pairs
+    in the order up, down, left, right.
+    """
+    table = []
+    for blank in range(size * size):
+        row, col = divmod(blank, size)
+        moves = []
+        if row != 0:
+            moves.append(('up', blank - size))
+        if row != size - 1:
+            moves.append(('down', blank + size))
+        if col != 0:
+            moves.append(('left', blank - 1))
+        if col != size - 1:
+            moves.append(('right', blank + 1))
+        table.append(tuple(moves))
+    return tuple(table)
+
+
+INVERSE_MOVES = {'up': 'down', 'down': 'up', 'left': 'right', 'right': 'left'}
+
+
+class SlidingPuzzleState:
+    """
+    A board of the SIZE x SIZE sliding-tile puzzle.
+
+    Subclasses fix SIZE and the default GOAL_NUMBERS; the move tables every
+    instance shares are derived from them once, when the subclass is
+    defined, so a state carries only its packed board and blank cell.
+    Boards of up to 16 cells fit the 4-bits-per-tile encoding.
+    """
+
+    __slots__ = ('packed', 'blank', '_cells')
+
+    SIZE = None
+    GOAL_NUMBERS = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.CELLS = cls.SIZE * cls.SIZE
+        cls.MOVE_TABLE = buildMoveTable(cls.SIZE)
+        cls.MOVE_LOOKUP = tuple(dict(moves) for moves in cls.MOVE_TABLE)
+        cls.BOARD_MOVES = tuple(tuple((move, 1) for move, _ in moves) for moves in cls.MOVE_TABLE)
+        cls.GOAL_PACKED = packNumbers(cls.GOAL_NUMBERS)
 
     def __init__( self, numbers ):
         """
-                  Constructs a new eight puzzle from an ordering of numbers.
+                  Constructs a new puzzle from an ordering of numbers.
 
-                numbers: a list of integers from 0 to 8 representing an
-                  instance of the eight puzzle.  0 represents the blank
+                numbers: a list of integers from 0 to CELLS-1 representing an
+                  instance of the puzzle.  0 represents the blank
                   space.  Thus, the list
 
                     [1, 0, 2, 3, 4, 5, 6, 7, 8]
@@ -48,43 +215,82 @@ class EightPuzzleState:
                     | 6 | 7 | 8 |
                     ------------
 
-                The configuration of the puzzle is stored in a 2-dimensional
-                list (a list of lists) 'cells'.
+                The configuration of the puzzle is stored packed into the
+                integer 'packed' (4 bits per tile) together with the index
+                of the blank cell in 'blank'.  The 2-dimensional list view
+                'cells' is built lazily on first access.
+        """
+        if len(numbers) != self.CELLS:
+            raise ValueError(f"Expected {self.CELLS} tiles, got {len(numbers)}")
+        self.packed = packNumbers(numbers)
+        self.blank = list(numbers).index(0)
+        self._cells = None
+
+    @classmethod
+    def fromPacked(cls, packed, blank):
+        """
+          Builds a state directly from its packed encoding, skipping the
+          list conversion done by the constructor.
+        """
+        state = cls.__new__(cls)
+        state.packed = packed
+        state.blank = blank
+        state._cells = None
+        return state
+
+    @property
+    def cells(self):
         """
-        self.cells = []
-        numbers = numbers[:] # Make a copy so as not to cause side effects.
-        numbers.reverse()
-        for row in range( 3 ):
-            self.cells.append( [] )
-            for col in range( 3 ):
-                self.cells[row].append( numbers.pop() )
-                if self.cells[row][col] == 0:
-                    self.blankLocation = row, col
+          Read-only 2-dimensional list view of the board, built on demand.
+        """
+        if self._cells is None:
+            numbers = self.numbers()
+            size = self.SIZE
+            self._cells = [numbers[row * size:(row + 1) * size] for row in range(size)]
+        return self._cells
+
+    @property
+    def blankLocation(self):
+        return divmod(self.blank, self.SIZE)
+
+    def tile(self, index):
+        "Returns the tile at the row-major cell index"
+        return (self.packed >> (4 * index)) & 0xF
+
+    def rank(self):
+        "Returns the permutationRank of the board, a dense index in [0, CELLS!)"
+        packed = self.packed
+        cells = self.CELLS
+        rank = 0
+        seen = 0
+        for index in range(cells):
+            value = packed & 0xF
+            packed >>= 4
+            rank = rank * (cells - index) + value - (seen & ((1 << value) - 1)).bit_count()
+            seen |= 1 << value
+        return rank
+
+    @classmethod
+    def fromRank(cls, rank):
+        "Builds the state whose board has the given permutationRank"
+        return cls(permutationUnrank(rank, cls.CELLS))
+
+    def numbers(self):
+        "Returns the board as a flat row-major list of tiles"
+        return unpackNumbers(self.packed, self.CELLS)
 
     def isGoal(self):
         """
-                  Checks to see if the puzzle is in its goal state.
-
-                    -------------
-                    |   | 1 | 2 |
-                    -------------
-                    | 3 | 4 | 5 |
-                    -------------
-                    | 6 | 7 | 8 |
-                    -------------
+                  Checks to see if the puzzle is in the default GOAL_NUMBERS
+                  configuration.
 
-                >>> EightPuzzleState([0, 1, 2, 3, 4, 5, 6, 7, 8]).isGoal()
+                >>> EightPuzzleState([1, 2, 3, 8, 0, 4, 7, 6, 5]).isGoal()
                 True
 
                 >>> EightPuzzleState([1, 0, 2, 3, 4, 5, 6, 7, 8]).isGoal()
                 False
         """
-        goal = [[1, 2, 3], [8, 0, 4], [7, 6, 5]]  # Define the goal state
-        for row in range(3):
-            for col in range(3):
-                if self.cells[row][col] != goal[row][col]:
-                    return False
-        return True
+        return self.packed == self.GOAL_PACKED
 
     def legalMoves(self):
         """
@@ -96,87 +302,71 @@ class EightPuzzleState:
                 >>> EightPuzzleState([0, 1, 2, 3, 4, 5, 6, 7, 8]).legalMoves()
                 ['down', 'right']
         """
-        moves = []
-        row, col = self.blankLocation
-        if row != 0:
-            moves.append('up')
-        if row != 2:
-            moves.append('down')
-        if col != 0:
-            moves.append('left')
-        if col != 2:
-            moves.append('right')
-        return moves
+        return [move for move, _ in self.MOVE_TABLE[self.blank]]
 
     def result(self, move):
         """
-                  Returns a new eightPuzzle with the current state and blankLocation
+                  Returns a new puzzle with the current state and blankLocation
                 updated based on the provided move.
 
                 The move should be a string drawn from a list returned by legalMoves.
-                Illegal moves will raise an exception, which may be an array bounds
-                exception.
+                Illegal moves will raise a ValueError.
 
                 NOTE: This function *does not* change the current object.  Instead,
                 it returns a new object.
         """
-        row, col = self.blankLocation
-        if (move == 'up'):
-            newrow = row - 1
-            newcol = col
-        elif (move == 'down'):
-            newrow = row + 1
-            newcol = col
-        elif (move == 'left'):
-            newrow = row
-            newcol = col - 1
-        elif (move == 'right'):
-            newrow = row
-            newcol = col + 1
-        else:
+        newBlank = self.MOVE_LOOKUP[self.blank].get(move)
+        if newBlank is None:
             raise ValueError("Illegal Move")
+        return self._slide(newBlank)
 
-        # Create a copy of the current eightPuzzle
-        newPuzzle = EightPuzzleState([0, 0, 0, 0, 0, 0, 0, 0, 0])
-        newPuzzle.cells = [values[:] for values in self.cells]
-        # And update it to reflect the move
-        newPuzzle.cells[row][col] = self.cells[newrow][newcol]
-        newPuzzle.cells[newrow][newcol] = self.cells[row][col]
-        newPuzzle.blankLocation = newrow, newcol
+    def successors(self):
+        """
+          Returns the list of (move, state) pairs reachable in one move,
+          generated straight from the precomputed move table.
+        """
+        return [(move, self._slide(newBlank)) for move, newBlank in self.MOVE_TABLE[self.blank]]
 
-        return newPuzzle
+    def _slide(self, newBlank):
+        # The blank nibble is zero, so XOR-ing the moved tile into both
+        # cells clears its old position and writes its new one.
+        tile = (self.packed >> (4 * newBlank)) & 0xF
+        packed = self.packed ^ (tile << (4 * newBlank)) ^ (tile << (4 * self.blank))
+        return self.fromPacked(packed, newBlank)
 
     # Utilities for comparison and display
     def __eq__(self, other):
         """
-                    Overloads '==' such that two eightPuzzles with the same configuration
+                    Overloads '==' such that two puzzles with the same configuration
                   are equal.
 
                   >>> EightPuzzleState([0, 1, 2, 3, 4, 5, 6, 7, 8]) == \
                       EightPuzzleState([1, 0, 2, 3, 4, 5, 6, 7, 8]).result('left')
                   True
         """
-        for row in range(3):
-            if self.cells[row] != other.cells[row]:
-                return False
-        return True
+        if not isinstance(other, SlidingPuzzleState):
+            return NotImplemented
+        return self.packed == other.packed and self.CELLS == other.CELLS
 
     def __hash__(self):
-        return hash(str(self.cells))
+        # The packed board already fits in a machine word and is unique per
+        # configuration, so it doubles as the hash.
+        return self.packed
 
     def __getAsciiString(self):
         """
           Returns a display string for the maze
         """
+        width = len(str(self.CELLS - 1))
         lines = []
-        horizontalLine = ('-' * (13))
+        horizontalLine = ('-' * (self.SIZE * (width + 3) + 1))
         lines.append(horizontalLine)
         for row in self.cells:
             rowLine = '|'
             for col in row:
                 if col == 0:
                     col = ' '
-                rowLine = rowLine + ' ' + col.__str__() + ' |'
+                rowLine = rowLine + ' ' + col.__str__().rjust(width) + ' |'
             lines.append(rowLine)
             lines.append(horizontalLine)
         return '\n'.join(lines)
@@ -185,22 +375,146 @@ class EightPuzzleState:
         return self.__getAsciiString()
 
 
+class EightPuzzleState(SlidingPuzzleState):
+    """
+    The Eight Puzzle is described in the course textbook on
+    page 64.
+
+    This class defines the mechanics of the puzzle itself.  The
+    task of recasting this puzzle as a search problem is left to
+    the EightPuzzleSearchProblem class.
+    """
+
+    __slots__ = ()
+
+    SIZE = PUZZLE_SIZE
+    GOAL_NUMBERS = GOAL_NUMBERS
+
+
+class FifteenPuzzleState(SlidingPuzzleState):
+    """
+    The 4 x 4 Fifteen Puzzle, solved to the row-major goal with the blank
+    in the bottom-right cell.
+    """
+
+    __slots__ = ()
+
+    SIZE = 4
+    GOAL_NUMBERS = list(range(1, 16)) + [0]
+
+
+PUZZLE_CLASSES = {      # State class of every supported board size, selectable with --size
+    3: EightPuzzleState,
+    4: FifteenPuzzleState,
+}
+
+
+def puzzleState(numbers):
+    """
+    Builds the state of the flat numbers list, picking the puzzle class
+    from the number of tiles.
+    """
+    puzzleClass = PUZZLE_CLASSES.get(math.isqrt(len(numbers)))
+    if puzzleClass is None or puzzleClass.CELLS != len(numbers):
+        raise ValueError(f"Unsupported board of {len(numbers)} tiles")
+    return puzzleClass(numbers)
+
+
+class SlidingPuzzleBoard:
+    """
+      Mutable counterpart of SlidingPuzzleState for depth-first engines.
+
+      A single board is walked through the whole search: apply(move) slides
+      a tile in place and undo(move) slides it back, each in O(1) on the
+      packed encoding, so no state object is built per node.  snapshot()
+      materialises an immutable state when one must outlive the next move,
+      e.g. on the returned solution path.
+
+      The board exposes 'packed', 'blank' and numbers() like a state, so
+      heuristics can read it directly through view().
+    """
+
+    __slots__ = ('packed', 'blank', 'goalPacked', 'puzzleClass')
+
+    def __init__(self, state, goal):
+        "state: the SlidingPuzzleState to start from.  goal: the state to reach."
+        self.packed = state.packed
+        self.blank = state.blank
+        self.goalPacked = goal.packed
+        self.puzzleClass = type(state)
+
+    def key(self):
+        "Hashable value identifying the current configuration"
+        return self.packed
+
+    def moves(self):
+        "Returns the legal (move, stepCost) pairs from the current configuration"
+        return self.puzzleClass.BOARD_MOVES[self.blank]
+
+    def apply(self, move):
+        "Slides the tile selected by move into the blank, in place"
+        newBlank = self.puzzleClass.MOVE_LOOKUP[self.blank][move]
+        tile = (self.packed >> (4 * newBlank)) & 0xF
+        self.packed ^= (tile << (4 * newBlank)) ^ (tile << (4 * self.blank))
+        self.blank = newBlank
+
+    def undo(self, move):
+        "Reverts a previous apply(move)"
+        self.apply(INVERSE_MOVES[move])
+
+    def isGoal(self):
+        return self.packed == self.goalPacked
+
+    def view(self):
+        "Object heuristics can evaluate; only valid until the next move"
+        return self
+
+    def snapshot(self):
+        "Returns the current configuration as an immutable state"
+        return self.puzzleClass.fromPacked(self.packed, self.blank)
+
+    def numbers(self):
+        return unpackNumbers(self.packed, self.puzzleClass.CELLS)
+
+
 class EightPuzzleSearchProblem(search.SearchProblem):
     """
       Implementation of a SearchProblem for the  Eight Puzzle domain
 
-      Each state is represented by an instance of an eightPuzzle.
+      Each state is represented by an instance of an eightPuzzle, or of any
+      other SlidingPuzzleState class for larger boards.
     """
 
-    def __init__(self,puzzle):
-        "Creates a new EightPuzzleSearchProblem which stores search information."
+    integerCosts = True     # Every move costs 1, so f-values are small integers
+    bitsetExplored = False  # True keeps BFS/DFS's closed list as a bitset over getStateIndex:
+                            # 1 bit per board, but about 3x slower than hashing packed states
+
+    def __init__(self,puzzle,goal=None):
+        """
+          Creates a new EightPuzzleSearchProblem which stores search information.
+
+          goal: the state to reach; defaults to the GOAL_NUMBERS of the
+          puzzle's class.
+        """
         self.puzzle = puzzle
+        self.goal = goal if goal is not None else type(puzzle)(type(puzzle).GOAL_NUMBERS)
 
     def getStartState(self):
         return self.puzzle
 
+    def getGoalState(self):
+        return self.goal
+
     def isGoalState(self,state):
-        return state.isGoal()
+        return state == self.goal
+
+    def getStateCount(self):
+        "Number of distinct boards, the size of the getStateIndex range"
+        return math.factorial(self.puzzle.CELLS)
+
+    def getStateIndex(self, state):
+        "Dense index of state in [0, getStateCount()), used for bitset closed lists"
+        return state.rank()
 
     def getSuccessors(self, state):
         """
@@ -208,10 +522,19 @@ class EightPuzzleSearchProblem(search.SearchProblem):
                   each succesor is either left, right, up, or down
                   from the original state and the cost is 1.0 for each
         """
-        succ = []
-        for a in state.legalMoves():
-            succ.append((state.result(a), a, 1))
-        return succ
+        return [(child, move, 1) for move, child in state.successors()]
+
+    def getPredecessors(self, state):
+        """
+                  Returns list of (predecessor, action, stepCost) triples where
+                  action takes the predecessor to state.  Every move can be
+                  undone, so these are the successors with inverted actions.
+        """
+        return [(parent, INVERSE_MOVES[move], 1) for move, parent in state.successors()]
+
+    def getStartBoard(self):
+        "Mutable board at the start state, used by the depth-first engines"
+        return SlidingPuzzleBoard(self.puzzle, self.goal)
 
     def getCostOfActions(self, actions):
         """
@@ -223,53 +546,408 @@ class EightPuzzleSearchProblem(search.SearchProblem):
         return len(actions)
 
 
+class DistanceDatabase:
+    """
+      Exact goal distance of every state reachable from a fixed goal.
+
+      The table is built once by a breadth-first search backwards from the
+      goal and stored on disk as one byte per state.  A state is indexed by
+      its blank cell and the rank of its tiles read without the blank.  Tile
+      ranks 2k and 2k+1 differ only by swapping the last two tiles, which
+      flips the tile parity, so exactly one of them can reach the goal and
+      rank // 2 indexes the 9!/2 reachable states densely.  The file is
+      memory-mapped, so loading it costs only the mmap.
+
+      Lookups are only meaningful for states that can reach the goal.
+      Instances are used as heuristics: database(state, problem).
+    """
+
+    UNREACHED = 0xFF
+    integral = True
+
+    def __init__(self, goal, directory=None):
+        "goal: the flat goal list.  directory: where the table file lives."
+        if len(goal) != PUZZLE_CELLS:
+            raise ValueError("Exact distances are only available for the 8-puzzle")
+        self.goal = list(goal)
+        if directory is None:
+            directory = os.path.dirname(os.path.abspath(__file__))
+        self.filename = os.path.join(directory, DistanceDatabase.fileName(goal))
+        if not os.path.exists(self.filename):
+            DistanceDatabase.build(goal, self.filename)
+        with open(self.filename, "rb") as file:
+            self.table = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.table) != DistanceDatabase.tableSize():
+            raise ValueError(f"Corrupt distance database: {self.filename}")
+
+    @staticmethod
+    def fileName(goal):
+        return "distances_" + "".join(str(tile) for tile in goal) + ".db"
+
+    @staticmethod
+    def tableSize():
+        return math.factorial(PUZZLE_CELLS) // 2
+
+    @staticmethod
+    def index(numbers):
+        "Returns the table index of the flat board numbers"
+        tiles = [tile - 1 for tile in numbers if tile != 0]
+        return numbers.index(0) * (DistanceDatabase.tableSize() // PUZZLE_CELLS) + permutationRank(tiles) // 2
+
+    @staticmethod
+    def build(goal, filename):
+        """
+          Runs a breadth-first search from goal and writes the distance of
+          every reachable state, at its index(), to filename.
+        """
+        table = bytearray([DistanceDatabase.UNREACHED]) * DistanceDatabase.tableSize()
+        start = EightPuzzleState(goal)
+        table[DistanceDatabase.index(list(goal))] = 0
+        layer = [start]
+        distance = 0
+        while layer:
+            distance += 1
+            nextLayer = []
+            for state in layer:
+                for move, child in state.successors():
+                    index = DistanceDatabase.index(child.numbers())
+                    if table[index] == DistanceDatabase.UNREACHED:
+                        table[index] = distance
+                        nextLayer.append(child)
+            layer = nextLayer
+        writeTable(filename, table)
+
+    def distance(self, state):
+        "Returns the exact number of moves from state to the goal"
+        return self.table[DistanceDatabase.index(state.numbers())]
+
+    def __call__(self, state, problem=None):
+        return self.distance(state)
+
+
+def writeTable(filename, table):
+    """
+    Writes a database table to filename atomically: it goes to a temporary
+    file in the same directory, which then replaces filename, so readers
+    never map a partly written table and a crash leaves no corrupt file.
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    handle, temporary = tempfile.mkstemp(dir=directory, prefix=os.path.basename(filename) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(handle, "wb") as file:
+            file.write(table)
+        os.chmod(temporary, 0o644)     # mkstemp creates the file private to its owner
+        os.replace(temporary, filename)
+    except BaseException:
+        os.remove(temporary)
+        raise
+
+
+def exactDistance(goal):
+    """
+    Returns the exact-distance heuristic for the flat goal list, building
+    its database file on first use.
+    """
+    return DistanceDatabase(goal)
+
+
+class PatternDatabase:
+    """
+      Goal distances of one group of tiles, counting only the moves of
+      those tiles.
+
+      The abstraction keeps the pattern tiles and the blank and treats all
+      other tiles as indistinguishable.  A 0-1 breadth-first search
+      backwards from the goal charges a move only when a pattern tile
+      slides, and the table keeps the smallest distance over all blank
+      cells.  Tables of disjoint groups can therefore be added and still
+      never overestimate (see DisjointPatternDatabase).
+
+      A placement of the pattern tiles is indexed by placementRank, so the
+      table holds cells! / (cells-k)! bytes.  It works for any square board
+      given by the length of goal, e.g. 5-tile groups of the 15-puzzle.  The
+      table is written to disk once and memory-mapped on its first lookup.
+    """
+
+    UNREACHED = 0xFF
+
+    def __init__(self, goal, tiles, directory=None):
+        "goal: the flat goal list.  tiles: the pattern tiles.  directory: where the table file lives."
+        self.goal = list(goal)
+        self.tiles = tuple(tiles)
+        self.cells = len(self.goal)
+        if directory is None:
+            directory = os.path.dirname(os.path.abspath(__file__))
+        self.filename = os.path.join(directory, PatternDatabase.fileName(goal, tiles))
+        self.table = None
+
+    @staticmethod
+    def fileName(goal, tiles):
+        return ("patterns_" + "".join(format(tile, "x") for tile in goal) +
+                "_" + "".join(format(tile, "x") for tile in tiles) + ".db")
+
+    @staticmethod
+    def tableSize(cells, count):
+        "Number of placements of count distinct tiles on cells cells"
+        return math.perm(cells, count)
+
+    @staticmethod
+    def build(goal, tiles, filename):
+        """
+          Runs the 0-1 breadth-first search from goal over placements of
+          tiles plus the blank and writes, for every placement of tiles, the
+          fewest pattern moves to the goal to filename.
+        """
+        cells = len(goal)
+        neighbours = [[newBlank for move, newBlank in moves] for moves in buildMoveTable(math.isqrt(cells))]
+        free = cells - len(tiles)       # Cells the blank can take for a fixed placement
+        distances = bytearray([PatternDatabase.UNREACHED]) * (PatternDatabase.tableSize(cells, len(tiles)) * free)
+
+        start = tuple(goal.index(tile) for tile in tiles) + (goal.index(0),)
+        distances[placementRank(start, cells)] = 0
+        frontier = collections.deque([(start, 0)])
+        while frontier:
+            positions, distance = frontier.popleft()
+            if distance > distances[placementRank(positions, cells)]:
+                continue        # Superseded by a cheaper entry
+            blank = positions[-1]
+            for newBlank in neighbours[blank]:
+                if newBlank in positions:       # A pattern tile slides into the blank
+                    slid = positions.index(newBlank)
+                    child = positions[:slid] + (blank,) + positions[slid + 1:-1] + (newBlank,)
+                    childDistance = distance + 1
+                else:                           # Other tiles move for free
+                    child = positions[:-1] + (newBlank,)
+                    childDistance = distance
+                index = placementRank(child, cells)
+                if childDistance < distances[index]:
+                    distances[index] = childDistance
+                    if childDistance == distance:
+                        frontier.appendleft((child, childDistance))
+                    else:
+                        frontier.append((child, childDistance))
+
+        # The blank is ranked last, so each placement's blank cells are contiguous
+        table = bytearray(min(distances[index:index + free]) for index in range(0, len(distances), free))
+        writeTable(filename, table)
+
+    def load(self):
+        "Builds the table file if missing and memory-maps it"
+        if not os.path.exists(self.filename):
+            PatternDatabase.build(self.goal, self.tiles, self.filename)
+        with open(self.filename, "rb") as file:
+            self.table = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.table) != PatternDatabase.tableSize(self.cells, len(self.tiles)):
+            raise ValueError(f"Corrupt pattern database: {self.filename}")
+
+    def lookup(self, positions):
+        "positions[tile] is the cell of tile; returns the pattern distance"
+        if self.table is None:
+            self.load()
+        rank = 0
+        seen = 0
+        count = self.cells
+        for tile in self.tiles:
+            position = positions[tile]
+            rank = rank * count + position - (seen & ((1 << position) - 1)).bit_count()
+            seen |= 1 << position
+            count -= 1
+        return self.table[rank]
+
+
+PATTERN_GROUP_SIZES = {9: 4, 16: 5}     # Tiles per pattern group, by board cells
+
+
+def patternGroups(goal, groupSize=None):
+    """
+    Splits the tiles of goal into disjoint groups of groupSize, taking the
+    tiles in the row-major order of their goal cells so every group covers
+    a compact region of the board (4-4 for the 8-puzzle, 5-5-5 for the
+    15-puzzle).
+    """
+    if groupSize is None:
+        groupSize = PATTERN_GROUP_SIZES.get(len(goal), 4)
+    tiles = [tile for tile in goal if tile != 0]
+    return [tuple(tiles[start:start + groupSize]) for start in range(0, len(tiles), groupSize)]
+
+
+class DisjointPatternDatabase:
+    """
+      Additive heuristic over pattern databases of disjoint tile groups.
+
+      Every move slides one tile, which belongs to at most one group, so
+      the sum of the group distances never overestimates the goal distance.
+      The group tables are loaded or built on their first lookup, or all
+      at once by load().  Instances are used as heuristics: database(state, problem).
+    """
+
+    integral = True
+
+    def __init__(self, goal, groups=None, directory=None):
+        "goal: the flat goal list.  groups: disjoint tile tuples, see patternGroups."
+        if groups is None:
+            groups = patternGroups(goal)
+        self.cells = len(goal)
+        self.databases = [PatternDatabase(goal, tiles, directory) for tiles in groups]
+
+    def __call__(self, state, problem=None):
+        positions = [0] * self.cells
+        packed = state.packed
+        for cell in range(self.cells):
+            positions[packed & 0xF] = cell
+            packed >>= 4
+        return sum(database.lookup(positions) for database in self.databases)
+
+    def load(self):
+        "Builds any missing group tables and memory-maps all of them"
+        for database in self.databases:
+            if database.table is None:
+                database.load()
+
+
+def patternDatabase(goal):
+    """
+    Returns the additive pattern database heuristic for the flat goal list.
+    """
+    return DisjointPatternDatabase(goal)
+
+
 searchCompare = []     # Global list to store the Search Comparison results
 
+BUDGETED_ALGORITHMS = ["BFS", "DFS", "UCS", "GBS", "A*", "WA*", "ARA*", "IDA*", "IDDFS"]   # Honour --max-nodes / --max-seconds / --max-memory
+
+HEURISTICS = {      # Heuristic factories selectable with --heuristic, each taking the flat goal list
+    "misplaced": search.misplacedHeuristic,
+    "manhattan": search.manhattanHeuristic,
+    "linear": search.linearConflictHeuristic,
+    "walking": search.walkingDistanceHeuristic,
+    "exact": exactDistance,
+    "pdb": patternDatabase,
+}
+
 
 def parseValue(temp):
     """
     Parses a 2D list from command-line input
     """
-    state = eval(temp.replace("-", "0"))  # Replace '-' with '0'    (R)
-    result = list(itertools.chain(*state))  # Flatten the 2D list (R)
-    return result
+    return parseBoard(temp)     # Replaces '-' with '0' and flattens the 2D list
 
 
-def runSearch(algorithm, problem, heuristic=None):
+def searchResult(algorithm, problem, heuristic=None, stats=None, budgets=None, weight=None, iterations=None):
     """
-    Runs the search algorithm and returns the result.
+    Runs the search algorithm and returns its (actions, nodesExpanded, path, depth) result.
+    stats, a search.SearchStats, is filled in by the generic_search based algorithms.
+    budgets, a dict of generic_search's max_nodes / max_seconds / max_memory
+    arguments, is honoured by the BUDGETED_ALGORITHMS and ignored by the others.
+    weight is the heuristic weight of WA* and the starting weight of ARA*, which
+    returns its last search.AnytimeResult, with the stopping budget as its reason
+    if one ran out, or search.BudgetExhausted if none ran out before a solution.
+    If iterations is a list, IDA* and IDDFS append the (bound, nodesExpanded) of
+    every iteration to it.
     """
-    startTime = time.time()
-
+    budgets = budgets or {}
     #Based on the user input, the function will run the requested algorithm
     if algorithm == "BFS":
-        result, nodesExpanded, path, depth = search.breadthFirstSearch(problem)
+        return search.breadthFirstSearch(problem, stats, **budgets)
     elif algorithm == "DFS":
-        result, nodesExpanded, path, depth = search.depthFirstSearch(problem)
+        return search.depthFirstSearch(problem, stats, **budgets)
     elif algorithm == "UCS":
-        result, nodesExpanded, path, depth = search.uniformCostSearch(problem)
+        return search.uniformCostSearch(problem, stats, **budgets)
     elif algorithm == "GBS":
-        result, nodesExpanded, path, depth = search.greedyBestFirstSearch(problem, heuristic)
+        return search.greedyBestFirstSearch(problem, heuristic, stats, **budgets)
     elif algorithm == "A*":
-        result, nodesExpanded, path, depth = search.aStarSearch(problem, heuristic)
-
+        return search.aStarSearch(problem, heuristic, stats, **budgets)
+    elif algorithm == "WA*":
+        return search.weightedAStarSearch(problem, heuristic, weight or search.DEFAULT_WEIGHT, stats, **budgets)
+    elif algorithm == "ARA*":
+        result = ([], 0, [], 0)     #Stays unsolved if the state space holds no goal
+        options = {"weight": weight} if weight else {}
+        results = search.anytimeAStarSearch(problem, heuristic, **options, **budgets)
+        while True:
+            try:
+                result = next(results)
+            except StopIteration as stop:
+                exhausted = stop.value     #BudgetExhausted when a budget stopped ARA*, else None
+                break
+        if exhausted is None:
+            return result
+        if not isinstance(result, search.AnytimeResult):   #No solution before the budget ran out
+            return exhausted
+        return search.AnytimeResult(result[0], exhausted.nodesExpanded, result[2], result.cost, result.weight,
+                                    result.bound, result.elapsed, result.history, exhausted.reason)
+    elif algorithm == "IDA*":
+        return search.idaStarSearch(problem, heuristic, iterations, **budgets)
+    elif algorithm == "IDDFS":
+        return search.iterativeDeepeningSearch(problem, iterations, **budgets)
+    elif algorithm == "BiBFS":
+        return search.bidirectionalBreadthFirstSearch(problem)
+    elif algorithm == "BiA*":
+        return search.bidirectionalAStarSearch(problem, heuristic)
+    raise ValueError(f"Unknown search algorithm: {algorithm}")
+
+
+def runSearch(algorithm, problem, heuristic=None, stats=None, budgets=None, weight=None, iterations=None):
+    """
+    Runs the search algorithm and returns the result.  The last value is the
+    search result itself when it carries more than the path: the
+    search.BudgetExhausted result when a budget stopped the search, or the
+    search.AnytimeResult of ARA*; else None.
+    """
+    startTime = time.time()
+    searched = searchResult(algorithm, problem, heuristic, stats, budgets, weight, iterations)
     endTime = time.time()
+    result, nodesExpanded, path, depth = searched
     timeTaken = endTime - startTime #Calcultes the tame taken to solve the problem
     cost = problem.getCostOfActions(result) #Calcultes the path cost to solve the problem
-    return path, cost, depth, timeTaken, nodesExpanded
+    details = searched if isinstance(searched, (search.BudgetExhausted, search.AnytimeResult)) else None
+    return path, cost, depth, timeTaken, nodesExpanded, details
+
+
+def compareTask(task):
+    """
+    Runs one (algorithm, heuristic name, initial, goal) comparison task and
+    returns the arguments for searchValues.  The time is measured inside the
+    process that runs the search, so pool contention does not skew it.
+    """
+    algorithm, heuristicName, initial, goal = task
+    problem = EightPuzzleSearchProblem(puzzleState(initial), puzzleState(goal))
+    stats = search.SearchStats()
+    path, cost, depth, timeTaken, nodesExpanded, details = runSearch(algorithm, problem, cachedHeuristic(heuristicName, goal), stats)
+    return algorithm, heuristicName, cost, depth, timeTaken, nodesExpanded, dict(stats)
 
 
-def searchValues(algorithm, heuristic, cost, depth, timeTaken, nodesExpanded):
+def runComparison(algorithms, initial, goal, workers=None):
+    """
+    Runs every (algorithm, heuristic name) pair on the puzzle and returns
+    their compareTask results in the order of algorithms.  With more than
+    one worker the runs are spread over a process pool; workers=None uses
+    one per CPU and workers=1 runs them in this process.
+    """
+    tasks = [(algorithm, heuristicName, initial, goal) for algorithm, heuristicName in algorithms]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(tasks))
+    if workers <= 1:
+        return [compareTask(task) for task in tasks]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(compareTask, tasks))
+
+
+def searchValues(algorithm, heuristic, cost, depth, timeTaken, nodesExpanded, stats=None):
     """
     Stores the Search results to be displayed in the comparison table
     """
+    stats = stats or {}
     searchCompare.append({
         'Algorithm': algorithm,
         'Heuristic': heuristic if heuristic else "N/A",
         'Path Cost': cost,
         'Depth': depth,
         'Time Taken': f"{timeTaken:.4f} sec",
-        'Nodes Expanded': nodesExpanded
+        'Nodes Expanded': nodesExpanded,
+        'Generated': stats.get('successorsGenerated', "N/A"),
+        'Duplicates': stats.get('suppressedPushes', "N/A"),
+        'Peak Frontier': stats.get('peakFrontier', "N/A"),
     })
 
 
@@ -283,9 +961,29 @@ def solPath(path):
     return "\n".join(sol)
 
 
-def printOutput(algorithm, path, cost, depth, timeTaken, nodesExpanded, outputFile):
+def statsReport(stats):
+    """
+    Formats the search.SearchStats counters for the output file.  The timers
+    only cover the sampled expansions, so they are extrapolated to the run.
+    """
+    lines = [
+        f"Successors Generated: {stats['successorsGenerated']}",
+        f"Duplicate Pushes Suppressed: {stats['suppressedPushes']}",
+        f"Decreased Keys: {stats['decreasedKeys']}",
+        f"Peak Frontier Size: {stats['peakFrontier']}",
+        f"Explored Set Size: {stats['exploredSize']}",
+        f"Sampled Expansions: {stats['sampledExpansions']}",
+    ]
+    for key, label in (("successorsNs", "getSuccessors"), ("heuristicNs", "Heuristic"), ("frontierNs", "Frontier")):
+        lines.append(f"{label} Time (estimated): {stats.estimatedNs(key) / 1e9:.4f} seconds")
+    return "\n".join(lines) + "\n"
+
+
+def printOutput(algorithm, path, cost, depth, timeTaken, nodesExpanded, outputFile, stats=None, details=None, iterations=None):
     """
-    Prints the Search results to the output file.
+    Prints the Search results to the output file.  details is the last value
+    of runSearch: the budget report or the ARA* solution history.  iterations
+    are the (bound, nodesExpanded) rows of an IDA* or IDDFS run.
     """
     with open(outputFile, "w") as file:
         file.write(f"{algorithm} Search Algorithm:\n")
@@ -295,21 +993,53 @@ def printOutput(algorithm, path, cost, depth, timeTaken, nodesExpanded, outputFi
         file.write(f"Depth: {depth}\n")
         file.write(f"Time Taken: {timeTaken:.4f} seconds\n")
         file.write(f"Nodes Expanded: {nodesExpanded}\n")
+        if isinstance(details, search.BudgetExhausted):
+            file.write(f"Budget Exhausted: {details.reason}\n")
+            file.write(f"Best State: {details.bestState.cells}\n")
+            file.write(f"Best Heuristic Value: {details.bestH if details.bestH is not None else 'N/A'}\n")
+            file.write(f"Actions To Best State: {' '.join(details.bestActions)}\n")
+        elif isinstance(details, search.AnytimeResult):
+            file.write(f"Suboptimality Bound: {details.bound:.4f}\n")
+            if details.reason is not None:
+                file.write(f"Budget Exhausted: {details.reason} (the best solution found is kept)\n")
+            file.write("Anytime Solutions (Path Cost | Weight | Bound | Nodes Expanded | Time Taken):\n")
+            for solutionCost, weight, bound, expanded, elapsed in details.history:
+                file.write(f"  {solutionCost:<9} | {weight:<6g} | {bound:<6.4f} | {expanded:<14} | {elapsed:.4f} seconds\n")
+        if iterations:
+            file.write("Iterations (Bound | Nodes Expanded):\n")
+            for bound, expanded in iterations:
+                file.write(f"  {bound:<5} | {expanded}\n")
+        if stats:
+            file.write(statsReport(stats))
+        file.write("******************************\n")
+
+
+def printUnsolvable(algorithm, outputFile):
+    """
+    Prints to the output file that the puzzle cannot reach the goal.
+    """
+    with open(outputFile, "w") as file:
+        file.write(f"{algorithm} Search Algorithm:\n")
+        file.write("******************************\n")
+        file.write("Unsolvable: the initial state cannot reach the goal state (inversion parity differs).\n")
+        file.write("No search was run.\n")
         file.write("******************************\n")
 
 
-def searchTable(outputFile="output.txt"):
+def searchTable(outputFile="output.txt", solvable=True):
     """
     Prints the comparison table to the output file.
     """
     with open(outputFile, "a") as file:
         file.write("\nSearch Algorithms Comparison Table:\n")
-        file.write("Algorithm | Heuristic | Path Cost | Depth     | Time Taken | Nodes Expanded\n")
-        file.write("------------------------------------------------------------------------------\n")
+        file.write("Algorithm | Heuristic | Path Cost | Depth     | Time Taken | Nodes Expanded | Generated | Duplicates | Peak Frontier\n")
+        file.write("------------------------------------------------------------------------------------------------------------------\n")
+        if not solvable:
+            file.write("Unsolvable: the initial state cannot reach the goal state, no algorithm was run.\n")
         for result in searchCompare:
             file.write(
-                f"{result['Algorithm']:<9} | {result['Heuristic']:<9} | {result['Path Cost']:<9} | {result['Depth']:<9} | {result['Time Taken']:<9} | {result['Nodes Expanded']:<9}\n")
-        file.write("------------------------------------------------------------------------------\n")
+                f"{result['Algorithm']:<9} | {result['Heuristic']:<9} | {result['Path Cost']:<9} | {result['Depth']:<9} | {result['Time Taken']:<9} | {result['Nodes Expanded']:<14} | {result['Generated']:<9} | {result['Duplicates']:<10} | {result['Peak Frontier']:<9}\n")
+        file.write("------------------------------------------------------------------------------------------------------------------\n")
 
 
 def parseInput():
@@ -323,11 +1053,42 @@ def parseInput():
                         help="Search algorithm")
     parser.add_argument("--heuristic", type=str,
                         help="Heuristic function")
-    parser.add_argument("--initial", type=str, required=True,
+    parser.add_argument("--size", type=int, default=PUZZLE_SIZE, choices=sorted(PUZZLE_CLASSES),
+                        help="Board side length: 3 for the 8-puzzle, 4 for the 15-puzzle")
+    parser.add_argument("--initial", type=str,
                         help="Initial puzzle state")
-    parser.add_argument("--goal", type=str, required=True,
-                        help="Goal puzzle state")
-    return parser.parse_args()
+    parser.add_argument("--goal", type=str,
+                        help="Goal puzzle state (the default goal for --batch)")
+    parser.add_argument("--workers", type=int,
+                        help="Processes for the comparison runs and --batch (default: one per CPU, 1 runs in-process)")
+    parser.add_argument("--weight", type=float,
+                        help="Heuristic weight of WA* (default 2) or starting weight of ARA* (default 3)")
+    parser.add_argument("--max-nodes", type=int,
+                        help="Stop the selected search after expanding this many nodes")
+    parser.add_argument("--max-seconds", type=float,
+                        help="Stop the selected search after this many seconds")
+    parser.add_argument("--max-memory", type=float,
+                        help="Stop the selected search once the process uses this many MiB")
+    parser.add_argument("--batch", type=str,
+                        help="JSONL or CSV file of puzzles to solve in one run")
+    parser.add_argument("--batch-output", type=str,
+                        help="File for the batch result records (default: stdout)")
+    parser.add_argument("--chunk-size", type=int, default=64,
+                        help="Puzzles handed to a batch worker at a time")
+    args = parser.parse_args()
+    if not args.batch and (not args.initial or not args.goal):
+        parser.error("--initial and --goal are required unless --batch is given")
+    if args.weight is not None and args.weight < 1:
+        parser.error("--weight must be at least 1")
+    if args.heuristic == "exact" and args.size != PUZZLE_SIZE:
+        parser.error(f"--heuristic exact is only available for --size {PUZZLE_SIZE}")
+    if args.max_nodes is not None or args.max_seconds is not None or args.max_memory is not None:
+        if args.batch:
+            parser.error("--max-nodes, --max-seconds and --max-memory apply to a single search, not --batch")
+        if args.search not in BUDGETED_ALGORITHMS:
+            parser.error(f"--search {args.search} does not support --max-nodes, --max-seconds or --max-memory; "
+                         f"use one of {', '.join(BUDGETED_ALGORITHMS)}")
+    return args
 
 
 def searchFile(search_algorithm, heuristic):
@@ -339,50 +1100,301 @@ def searchFile(search_algorithm, heuristic):
     else:
         return (f"output_{search_algorithm}.txt")
 
+def parseBoard(value):
+    """
+    Parses a board from a batch record: a nested or flat list, or a string
+    holding one ("[[1,2,3],[8,-,4],[7,6,5]]") or its digits ("123804765").
+    Returns the flat list of tiles.
+    """
+    if isinstance(value, str):
+        value = value.strip().replace("-", "0")
+        if value.startswith("["):
+            value = json.loads(value)
+        else:
+            value = [int(tile) for tile in value if tile.isdigit()]
+    if value and isinstance(value[0], list):
+        value = list(itertools.chain(*value))
+    return value
+
+
+def readBatch(inputFile):
+    """
+    Yields (number, initial, goal) for every puzzle in a JSONL or CSV batch
+    file, one at a time.  goal is None when the record does not give one.
+
+    JSONL records are objects with an "initial" and an optional "goal" key.
+    CSV files have an "initial" and an optional "goal" column.
+    A record that cannot be parsed is passed on as it is (or as None), for
+    boardError to reject, so one bad line does not stop the batch.
+    """
+    with open(inputFile, newline="") as file:
+        if inputFile.endswith(".csv"):
+            records = csv.DictReader(file)
+        else:
+            records = (readRecord(line) for line in file if line.strip())
+        for number, record in enumerate(records, 1):
+            goal = record.get("goal")
+            yield number, readBoard(record.get("initial")), readBoard(goal) if goal else None
+
+
+def readRecord(line):
+    "Parses one JSONL batch line, giving {} for a line that is not a JSON object"
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return {}
+    return record if isinstance(record, dict) else {}
+
+
+def readBoard(value):
+    "parseBoard, giving back value unchanged when it cannot be parsed"
+    try:
+        return parseBoard(value)
+    except (ValueError, TypeError):
+        return value
+
+
+def boardError(initial, goal):
+    """
+    Returns why a batch puzzle cannot be solved as given, or None when both
+    boards are permutations of the tiles of the same supported board size.
+
+    >>> boardError([1, 2, 3, 8, 0, 4, 7, 6, 5], GOAL_NUMBERS) is None
+    True
+    >>> boardError([1, 2, 3, 8, 0, 4, 7, 6], GOAL_NUMBERS)
+    'initial board has 8 tiles'
+    >>> boardError([1, 1, 3, 8, 0, 4, 7, 6, 5], GOAL_NUMBERS)
+    'initial board is not a permutation of 0-8'
+    """
+    for name, board in (("initial", initial), ("goal", goal)):
+        if not isinstance(board, list) or not all(isinstance(tile, int) for tile in board):
+            return f"{name} board is not a list of tiles"
+        puzzleClass = PUZZLE_CLASSES.get(math.isqrt(len(board)))
+        if puzzleClass is None or puzzleClass.CELLS != len(board):
+            return f"{name} board has {len(board)} tiles"
+        if sorted(board) != list(range(len(board))):
+            return f"{name} board is not a permutation of 0-{len(board) - 1}"
+    if len(initial) != len(goal):
+        return "initial and goal boards have different sizes"
+    return None
+
+
+HEURISTIC_CACHE_SIZE = 4        # Heuristics kept alive at once; batches with many goals evict the oldest
+heuristicCache = collections.OrderedDict()     # Heuristics built for batch runs, keyed by (name, goal), least recently used first
+
+
+def cachedHeuristic(name, goal):
+    """
+    Returns the heuristic called name for the flat goal list, building its
+    tables only when that goal is not among the HEURISTIC_CACHE_SIZE most
+    recently used ones, so memory does not grow with the number of goals.
+    """
+    if name not in HEURISTICS:
+        return None
+    key = (name, tuple(goal))
+    if key in heuristicCache:
+        heuristicCache.move_to_end(key)
+    else:
+        heuristicCache[key] = HEURISTICS[name](goal)
+        if len(heuristicCache) > HEURISTIC_CACHE_SIZE:
+            heuristicCache.popitem(last=False)
+    return heuristicCache[key]
+
+
+def loadedHeuristic(name, goal):
+    """
+    cachedHeuristic, with the tables of a lazily loaded heuristic (one with
+    a load() method) built and mapped right away.
+    """
+    heuristic = cachedHeuristic(name, goal)
+    if hasattr(heuristic, "load"):
+        heuristic.load()
+    return heuristic
+
+
+def solveRecord(number, initial, goal, algorithm, heuristicName):
+    """
+    Solves one batch puzzle and returns its result record, or an
+    {"id": number, "error": ...} record when its boards are malformed or
+    the search fails on it (e.g. a heuristic that does not support its size).
+    """
+    error = boardError(initial, goal)
+    if error is not None:
+        return {"id": number, "error": error}
+    record = {"id": number, "initial": initial, "goal": goal,
+              "algorithm": algorithm, "heuristic": heuristicName,
+              "solvable": isSolvable(initial, goal)}
+    if not record["solvable"]:
+        return record
+
+    problem = EightPuzzleSearchProblem(puzzleState(initial), puzzleState(goal))
+    startTime = time.time()
+    try:
+        actions, nodesExpanded, path, depth = searchResult(algorithm, problem, cachedHeuristic(heuristicName, goal))
+    except Exception as error:     # One failing puzzle must not stop the batch
+        return {"id": number, "error": f"{type(error).__name__}: {error}"}
+    record.update({
+        "actions": actions,
+        "cost": problem.getCostOfActions(actions),
+        "depth": depth,
+        "timeTaken": time.time() - startTime,
+        "nodesExpanded": nodesExpanded,
+    })
+    return record
+
+
+def batchSolve(inputFile, algorithm, heuristicName=None, defaultGoal=GOAL_NUMBERS, output=None):
+    """
+    Solves every puzzle of a batch file in this process and writes one JSON
+    result record per line to output (stdout by default) as soon as each
+    puzzle finishes, so memory does not grow with the batch size.
+    Returns the number of puzzles solved.
+    """
+    output = output or sys.stdout
+    solved = 0
+    for number, initial, goal in readBatch(inputFile):
+        record = solveRecord(number, initial, goal or defaultGoal, algorithm, heuristicName)
+        output.write(json.dumps(record) + "\n")
+        output.flush()
+        solved += 1
+    return solved
+
+
+def solveChunk(chunk, algorithm, heuristicName):
+    """
+    Solves a list of (number, initial, goal) batch puzzles in a worker and
+    returns their result records.
+    """
+    return [solveRecord(number, initial, goal, algorithm, heuristicName) for number, initial, goal in chunk]
+
+
+def readChunks(inputFile, defaultGoal, chunkSize):
+    """
+    Yields the puzzles of a batch file in lists of at most chunkSize
+    (number, initial, goal) entries, filling in defaultGoal where needed.
+    """
+    chunk = []
+    for number, initial, goal in readBatch(inputFile):
+        chunk.append((number, initial, goal or defaultGoal))
+        if len(chunk) == chunkSize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def parallelBatchSolve(inputFile, algorithm, heuristicName=None, defaultGoal=GOAL_NUMBERS,
+                       output=None, workers=None, chunkSize=64):
+    """
+    Solves a batch file on a pool of worker processes and writes each result
+    record as soon as its chunk finishes, so records arrive in completion
+    order (use their "id" to restore input order).
+
+    Idle workers pull the next chunk from a shared queue, which balances
+    uneven puzzles across cores.  At most two chunks per worker are in
+    flight, so memory does not grow with the batch size.  The heuristic
+    tables for defaultGoal are built and loaded before the pool starts, so
+    no two workers build the same table file; forked workers inherit them
+    read-only, and other start methods load them once per worker in the
+    initializer.  Returns the number of puzzles solved.
+    """
+    output = output or sys.stdout
+    workers = workers or os.cpu_count() or 1
+    loadedHeuristic(heuristicName, defaultGoal)
+    solved = 0
+    chunks = readChunks(inputFile, defaultGoal, chunkSize)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=loadedHeuristic,
+                                                initargs=(heuristicName, defaultGoal)) as executor:
+        pending = set()
+        for chunk in itertools.islice(chunks, 2 * workers):
+            pending.add(executor.submit(solveChunk, chunk, algorithm, heuristicName))
+        while pending:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                for record in future.result():
+                    output.write(json.dumps(record) + "\n")
+                    solved += 1
+                output.flush()
+                for chunk in itertools.islice(chunks, 1):
+                    pending.add(executor.submit(solveChunk, chunk, algorithm, heuristicName))
+    return solved
+
+
 def main():
     """
        Main function where we run the Search Algorithms
     """
     args = parseInput()
+    puzzleClass = PUZZLE_CLASSES[args.size]
+
+    if args.batch:      #Batch mode: solve every puzzle of the file with the selected algorithm and stream the results
+        goal = parseValue(args.goal) if args.goal else puzzleClass.GOAL_NUMBERS
+        workers = args.workers or os.cpu_count() or 1
+        output = open(args.batch_output, "w") if args.batch_output else sys.stdout
+        startTime = time.time()
+        try:
+            if workers > 1:
+                solved = parallelBatchSolve(args.batch, args.search, args.heuristic, goal, output, workers, args.chunk_size)
+            else:
+                solved = batchSolve(args.batch, args.search, args.heuristic, goal, output)
+        finally:
+            if output is not sys.stdout:
+                output.close()
+        timeTaken = time.time() - startTime
+        sys.stderr.write(f"Solved {solved} puzzles in {timeTaken:.4f} seconds "
+                         f"({solved / timeTaken if timeTaken else 0:.1f} puzzles/sec, {workers} worker(s))\n")
+        return
 
     initial = parseValue(args.initial)  #Parses the initial and goal states from the input
     goal = parseValue(args.goal)
-
-    problem = EightPuzzleSearchProblem(EightPuzzleState(initial))   #Creates a search problem taking the initial state of the Puzzle
-
+    error = boardError(initial, goal)   #Rejects duplicate or missing tiles before the parity check
+    if error is not None:
+        sys.exit(f"Invalid puzzle: {error}")
+    if len(initial) != puzzleClass.CELLS:
+        sys.exit(f"--initial and --goal must have {puzzleClass.CELLS} tiles for --size {args.size}")
+
+    if not isSolvable(initial, goal):   #Parity pre-check: no algorithm can reach the goal, so none are run
+        printUnsolvable(args.search, searchFile(args.search, args.heuristic))
+        searchTable(solvable=False)
+        return
+
+    problem = EightPuzzleSearchProblem(puzzleState(initial), puzzleState(goal))   #Creates a search problem taking the initial and goal states of the Puzzle
     path, cost, depth, timeTaken, nodesExpanded = None, None, None, None, None #Initilizing the variables to store the results
 
     searchAlg = [   #All the search Algorithms available for this problem with their heuristics
         ("BFS", None),
         ("DFS", None),
         ("UCS", None),
-        ("GBS", search.misplacedTile),
-        ("GBS", search.manhattanDistance),
-        ("A*", search.misplacedTile),
-        ("A*", search.manhattanDistance),
+        ("GBS", "misplaced"),
+        ("GBS", "manhattan"),
+        ("A*", "misplaced"),
+        ("A*", "manhattan"),
+        ("BiBFS", None),
+        ("BiA*", "manhattan"),
     ]
+    if args.size > PUZZLE_SIZE:     #Blind searches cannot exhaust the larger state spaces, so only informed ones are compared
+        searchAlg = [(algorithm, heuristic_name) for algorithm, heuristic_name in searchAlg if heuristic_name == "manhattan"]
 
     selected_algorithm = args.search    #Chooses the appropriate Algorithm along with the heuristic depending on the input
-    selected_heuristic = search.misplacedTile \
-        if args.heuristic == "misplaced" \
-        else search.manhattanDistance \
-        if args.heuristic == "manhattan" \
-        else None
+    selected_heuristic = cachedHeuristic(args.heuristic, goal)     #Precomputes the heuristic tables once for this goal
 
-    path, cost, depth, timeTaken, nodesExpanded = runSearch(selected_algorithm, problem, selected_heuristic) #Runs the algorithms and stores the results in these variables
-    searchValues(selected_algorithm, args.heuristic if selected_heuristic else None, cost, depth, timeTaken, nodesExpanded) #This will be used for the Comparison table
+    stats = search.SearchStats()    #Collects the instrumentation counters of the generic_search based algorithms
+    budgets = {"max_nodes": args.max_nodes, "max_seconds": args.max_seconds,   #Budgets of the selected search; the comparison runs are unbounded
+               "max_memory": int(args.max_memory * 2 ** 20) if args.max_memory is not None else None}
+    iterations = []     #Per-iteration (bound, nodesExpanded) of IDA* and IDDFS
+    path, cost, depth, timeTaken, nodesExpanded, details = runSearch(selected_algorithm, problem, selected_heuristic, stats, budgets, args.weight, iterations) #Runs the algorithms and stores the results in these variables
+    if isinstance(details, search.BudgetExhausted):
+        cost = depth = "budget"     #No solution within the budget, so there is no path cost to report
+    searchValues(selected_algorithm, args.heuristic if selected_heuristic else None, cost, depth, timeTaken, nodesExpanded, stats) #This will be used for the Comparison table
 
     outputFile = searchFile(selected_algorithm, args.heuristic) #Generates the specific output file
-    printOutput(selected_algorithm, path, cost, depth, timeTaken, nodesExpanded, outputFile)
+    printOutput(selected_algorithm, path, cost, depth, timeTaken, nodesExpanded, outputFile, stats, details, iterations)
 
     #Runs the remaining Search Algorithms for the Comparison Table
-    for algorithm, heuristic in searchAlg:
-        heuristic_name = "misplaced" if heuristic == search.misplacedTile else "manhattan" if heuristic == search.manhattanDistance else None
-        if algorithm == selected_algorithm and heuristic_name == args.heuristic:
-            continue        # Skip the algorithm that was already run
-
-        path, cost, depth, timeTaken, nodesExpanded = runSearch(algorithm, problem, heuristic)
-        searchValues(algorithm, heuristic_name, cost, depth, timeTaken, nodesExpanded)
+    remaining = [(algorithm, heuristic_name) for algorithm, heuristic_name in searchAlg
+                 if not (algorithm == selected_algorithm and heuristic_name == args.heuristic)]  # Skip the algorithm that was already run
+    for result in runComparison(remaining, initial, goal, args.workers):
+        searchValues(*result)
 
     searchTable()   #Calls to output the table
 
@@ -17,6 +17,9 @@ In search.py, you will implement generic search algorithms which are called by
 Pacman agents (in searchAgents.py).
 """
 
+import time
+import heapq
+import itertools
 import util
 
 class SearchProblem:
@@ -61,131 +64,1313 @@ class SearchProblem:
         util.raiseNotDefined()
 
 
-def generic_search(problem, strategy, use_cost=False, heuristic=None):      #(R)
+BITSET_LIMIT = 1 << 32      # Largest state count given a bitset closed list (512 MiB)
+
+
+class SearchStats(util.Counter):
+    """
+        Counters filled in by generic_search when passed as its stats:
+
+          nodesExpanded         states expanded
+          successorsGenerated   successors returned by getSuccessors
+          suppressedPushes      successors dropped as duplicates: already
+                                explored, or already reached at no greater cost
+          decreasedKeys         queued states re-parented by a cheaper path
+          peakFrontier          largest frontier size seen at an expansion
+          exploredSize          states expanded or reached and no longer queued
+          sampledExpansions     expansions whose hot-path calls were timed
+          successorsNs, heuristicNs, frontierNs
+                                ns spent in getSuccessors, heuristic
+                                evaluation and frontier operations during
+                                the sampled expansions
+
+        Every sampleInterval-th expansion is timed, which keeps the timer
+        cost small.  Subclasses may override onExpand, which is called with
+        every expanded state.
+    """
+    sampleInterval = 64
+
+    def onExpand(self, state, nodesExpanded):
+        pass
+
+    def estimatedNs(self, key):
+        "Extrapolates a sampled timer to the whole search"
+        if not self['sampledExpansions']:
+            return 0
+        return self[key] * self['nodesExpanded'] / self['sampledExpansions']
+
+
+def timedCall(stats, key, function):
+    """
+        Returns function wrapped to add its running time, in ns, to stats[key].
+    """
+    counter = time.perf_counter_ns
+    def timed(*args):
+        startTime = counter()
+        result = function(*args)
+        stats[key] += counter() - startTime
+        return result
+    return timed
+
+
+def generic_search(problem, strategy, use_cost=False, heuristic=None, stats=None,
+                   max_nodes=None, max_seconds=None, max_memory=None, weight=1):      #(R)
+    """
+        weight: A* and GBS order the frontier by g + weight * h; a weight
+        above 1 gives weighted A*, whose solutions cost at most weight times
+        the optimum when the heuristic is admissible.
+
+        stats: optional util.Counter, e.g. a SearchStats; when given, the
+        search adds its counters to it (see SearchStats for the keys).
+        Without it the only instrumentation cost is one flag test per
+        expansion.
+
+        max_nodes, max_seconds, max_memory: optional budgets on the nodes
+        expanded, the wall-clock time and the resident memory in bytes
+        (util.residentMemory).  They are checked between expansions, the
+        clock and memory every BUDGET_CHECK_INTERVAL of them, and a search
+        that runs out returns a BudgetExhausted result instead of raising.
+    """
+    # A bucket queue replaces the binary heap when every priority is a small
+    # integer: the problem declares integer step costs and the heuristic, if
+    # any, declares integral values and is weighted by an integer.
+    bucketed = strategy in ["UCS", "A*", "GBS"] and getattr(problem, 'integerCosts', False) \
+        and (heuristic is None or strategy == "UCS" or getattr(heuristic, 'integral', False)) \
+        and isinstance(weight, int)
+
     if strategy == "BFS":           #Chooses the frontier based on the Algorithm
         frontier = util.Queue()
     elif strategy == "DFS":
         frontier = util.Stack()
+    elif bucketed:
+        frontier = util.BucketQueue()
     else:
         frontier = util.PriorityQueue()
 
     initial = problem.getStartState()       #Initilizes the initial state and the frontier
 
-    if strategy in ["UCS", "A*", "GBS"]:    #Adds the initial state to the frontier
-        frontier.push((initial, [], 0), 0)
+    # Node table: parallel arrays indexed by node id.  Each node only records
+    # its parent id and the move that produced it, and the action list is
+    # rebuilt once when the goal is reached.
+    states = [initial]
+    parents = [-1]
+    moves = [None]
+    costs = [0]
+
+    # Heuristics that expose delta(parentH, state, move) are evaluated
+    # incrementally from the parent's value, kept per node in hValues.
+    useHeuristic = strategy in ["A*", "GBS"] and heuristic is not None
+    delta = getattr(heuristic, 'delta', None) if useHeuristic else None
+    hValues = [heuristic(initial, problem)] if useHeuristic else None
+
+    # UCS/A*/GBS: bestNodes maps every generated state to the node holding
+    # its cheapest known path (its best g), and a successor is pushed only
+    # when it improves on that.  The frontier holds each state once, so a
+    # cheaper path to a queued state re-parents its node and lowers its key.
+    # BFS/DFS keep the explored set instead.
+    prioritized = strategy in ["UCS", "A*", "GBS"]
+    bestNodes = {}
+    suppressed = 0      #Counts the pushes avoided by duplicate detection
+
+    if prioritized:    #Adds the initial state to the frontier
+        frontier.push(initial, 0)
+        bestNodes[initial] = 0
     else:
-        frontier.push((initial, [], 0))
+        frontier.push(0)
 
-    explored = set()    #Initializing to store the explored nodes
+    # Initializing to store the explored nodes.  A problem that maps its states
+    # to dense indices can opt in to a bitset (bitsetExplored), which saves
+    # memory but pays for an index computation on every test; the default set
+    # hashes states, which is faster when states hash cheaply.
+    if prioritized:
+        explored = None
+    elif getattr(problem, 'bitsetExplored', False) and problem.getStateCount() <= BITSET_LIMIT:
+        explored = util.BitSet(problem.getStateCount(), problem.getStateIndex)
+    else:
+        explored = set()
     nodesExpanded = 0   #Counter
-    path = []           #Stores the paths visited
+    decreased = 0       #Counts the queued states re-parented by a cheaper path
+
+    # Budgets are checked when nodesExpanded reaches nextCheck, which stays
+    # -1 (never reached) when there are none.
+    budgeted = max_nodes is not None or max_seconds is not None or max_memory is not None
+    deadline = time.perf_counter() + max_seconds if max_seconds is not None else None
+    nextCheck = nextBudgetCheck(0, max_nodes) if budgeted else -1
+
+    # The hot-path calls go through these locals.  With stats, a sampled
+    # expansion swaps in timed wrappers of the same functions.
+    getSuccessors, evaluate, evaluateDelta = problem.getSuccessors, heuristic, delta
+    push, pop, update = frontier.push, frontier.pop, getattr(frontier, 'update', None)
+    instrumented = stats is not None
+    if instrumented:
+        plainCalls = (getSuccessors, evaluate, evaluateDelta, push, pop, update)
+        timedCalls = (timedCall(stats, 'successorsNs', getSuccessors),
+                      timedCall(stats, 'heuristicNs', evaluate) if evaluate is not None else None,
+                      timedCall(stats, 'heuristicNs', evaluateDelta) if evaluateDelta is not None else None,
+                      timedCall(stats, 'frontierNs', push),
+                      timedCall(stats, 'frontierNs', pop),
+                      timedCall(stats, 'frontierNs', update) if update is not None else None)
+        sampleInterval = getattr(stats, 'sampleInterval', SearchStats.sampleInterval)
+        onExpand = getattr(stats, 'onExpand', None)
+        peakFrontier = 1
+        sampled = 0
 
     while not frontier.isEmpty():   #Continues until the frontier is empty
-        if strategy in ["BFS", "DFS"]:
-            currentState, actions, currentCost = frontier.pop()
+        if prioritized:
+            currentState = pop()
+            node = bestNodes[currentState]
         else:
-            currentState, actions, currentCost = frontier.pop()
+            node = pop()
+            currentState = states[node]
 
         if problem.isGoalState(currentState):            # Check if the current state is the goal state
+            actions = reconstructActions(parents, moves, node)
+            path = generatedPath(states, parents, moves)
             path.append((currentState, "Goal Reached"))
+            if instrumented:
+                recordStats(stats, nodesExpanded, len(states) - 1 + suppressed + decreased, suppressed, decreased,
+                            peakFrontier, len(explored) if explored is not None else len(bestNodes) - len(frontier) - 1, sampled)
             return actions, nodesExpanded, path, len(actions)
 
-        if currentState in explored:        # If this state has already been explored, then skip it
-            continue
+        if not prioritized:
+            if currentState in explored:        # If this state has already been explored, then skip it
+                continue
+
+        if nodesExpanded == nextCheck:      # Cooperative budget check
+            reason = budgetReason(nodesExpanded, max_nodes, deadline, max_memory)
+            if reason is not None:
+                if instrumented:
+                    recordStats(stats, nodesExpanded, len(states) - 1 + suppressed + decreased, suppressed, decreased,
+                                peakFrontier, len(explored) if explored is not None else len(bestNodes) - len(frontier) - 1, sampled)
+                return budgetResult(reason, nodesExpanded, node, states, parents, moves, costs, hValues)
+            nextCheck = nextBudgetCheck(nodesExpanded, max_nodes)
 
-        explored.add(currentState)        # Mark the current state as explored and increment the counter
+        if not prioritized:
+            explored.add(currentState)        # Mark the current state as explored
         nodesExpanded += 1
+        currentCost = costs[node]
+
+        if instrumented:
+            peakFrontier = max(peakFrontier, len(frontier) + 1)
+            if nodesExpanded % sampleInterval == 0:
+                getSuccessors, evaluate, evaluateDelta, push, pop, update = timedCalls
+                sampled += 1
+            else:
+                getSuccessors, evaluate, evaluateDelta, push, pop, update = plainCalls
+            if onExpand is not None:
+                onExpand(currentState, nodesExpanded)
 
         # Finds all the possible actions that can be taken from the current state by taking an action(Successors)
-        for (succ, action, pathCost) in problem.getSuccessors(currentState):
-            newAction = actions + [action]
+        for (succ, action, pathCost) in getSuccessors(currentState):
             newCost = currentCost + pathCost
 
-            if succ not in explored:    #If not explored, adds the Successor to the frontier
-                if strategy in ["UCS", "A*", "GBS"]:
-                    priority = newCost
-                    if strategy == "A*" and heuristic:
-                        priority += heuristic(succ, problem)
-                    elif strategy == "GBS" and heuristic:
-                        priority += heuristic(succ, problem)
-                    frontier.push((succ, newAction, newCost), priority)
+            if prioritized:
+                known = bestNodes.get(succ)
+                if known is not None:
+                    if costs[known] <= newCost:     #No better than the best known path
+                        suppressed += 1
+                        continue
+                    if frontier.contains(succ):     #Cheaper path to a queued state (decrease-key)
+                        parents[known] = node
+                        moves[known] = action
+                        costs[known] = newCost
+                        priority = newCost + weight * hValues[known] if useHeuristic else newCost
+                        if bucketed:
+                            update(succ, priority, newCost)
+                        else:
+                            update(succ, priority)
+                        decreased += 1
+                        continue
+                    # Cheaper path to an already expanded state: reopen it below
+            elif succ in explored:
+                suppressed += 1
+                continue
+
+            #Records the Successor in the node table and adds it to the frontier
+            child = len(states)
+            states.append(succ)
+            parents.append(node)
+            moves.append(action)
+            costs.append(newCost)
+            if prioritized:
+                priority = newCost
+                if useHeuristic:
+                    if evaluateDelta is not None:
+                        h = evaluateDelta(hValues[node], succ, action)
+                    else:
+                        h = evaluate(succ, problem)
+                    hValues.append(h)
+                    priority += weight * h
+                if bucketed:
+                    push(succ, priority, newCost)     #Ties go to the deeper node
                 else:
-                    frontier.push((succ, newAction, newCost))
-                path.append((currentState, action))
+                    push(succ, priority)
+                bestNodes[succ] = child
+            else:
+                push(child)
+
+    if instrumented:
+        recordStats(stats, nodesExpanded, len(states) - 1 + suppressed + decreased, suppressed, decreased,
+                    peakFrontier, len(explored) if explored is not None else len(bestNodes), sampled)
+    return [], nodesExpanded, generatedPath(states, parents, moves), 0   #Returns empty if there's no solution
+
+
+BUDGET_CHECK_INTERVAL = 256    # Expansions between two clock / memory budget checks
+
+
+class BudgetExhausted(tuple):
+    """
+        Result of a generic_search, IDA*, IDDFS or ARA* run stopped by one
+        of its budgets.
+
+        It unpacks like an unsolved result, ([], nodesExpanded, path, 0), so
+        callers that ignore budgets still work, and adds:
+
+          reason        'max_nodes', 'max_seconds' or 'max_memory'
+          nodesExpanded states expanded before stopping
+          bestState     the generated state with the lowest heuristic value
+                        (the state being expanded when there is no heuristic)
+          bestH         its heuristic value, or None
+          bestActions   the actions leading from the start to bestState
+    """
+    def __new__(cls, reason, nodesExpanded, path, bestState, bestH, bestActions):
+        result = super().__new__(cls, ([], nodesExpanded, path, 0))
+        result.reason = reason
+        result.nodesExpanded = nodesExpanded
+        result.bestState = bestState
+        result.bestH = bestH
+        result.bestActions = bestActions
+        return result
 
-    return [], nodesExpanded, path, 0   #Returns empty if there's no solution
 
+def nextBudgetCheck(nodesExpanded, maxNodes):
+    "Node count of the next budget check"
+    nextCheck = nodesExpanded + BUDGET_CHECK_INTERVAL
+    return nextCheck if maxNodes is None else min(nextCheck, max(maxNodes, nodesExpanded))
 
-def breadthFirstSearch(problem):
+
+def budgetReason(nodesExpanded, maxNodes, deadline, maxMemory):
+    "Returns the name of the exhausted budget, or None"
+    if maxNodes is not None and nodesExpanded >= maxNodes:
+        return 'max_nodes'
+    if deadline is not None and time.perf_counter() >= deadline:
+        return 'max_seconds'
+    if maxMemory is not None and util.residentMemory() >= maxMemory:
+        return 'max_memory'
+    return None
+
+
+class BudgetClock:
+    """
+        Budget checks for the searches outside generic_search (IDDFS, IDA*,
+        ARA*), which count expansions across several iterations or passes.
+        exhausted() is called before every expansion and follows the same
+        schedule as generic_search.  The engine keeps best up to date as the
+        (state, h, actions) to report, and result() builds the BudgetExhausted
+        result once a budget has run out.
+    """
+    def __init__(self, max_nodes=None, max_seconds=None, max_memory=None):
+        self.maxNodes = max_nodes
+        self.maxMemory = max_memory
+        self.deadline = time.perf_counter() + max_seconds if max_seconds is not None else None
+        self.nextCheck = nextBudgetCheck(0, max_nodes)
+        self.expanded = 0
+        self.reason = None      # Name of the exhausted budget
+        self.best = None        # (state, h, actions) reported when a budget runs out
+
+    @staticmethod
+    def forBudgets(max_nodes=None, max_seconds=None, max_memory=None):
+        "Returns a BudgetClock, or None when no budget is set"
+        if max_nodes is None and max_seconds is None and max_memory is None:
+            return None
+        return BudgetClock(max_nodes, max_seconds, max_memory)
+
+    def exhausted(self):
+        "Returns True if a budget has run out, else counts one expansion"
+        if self.expanded == self.nextCheck:
+            self.reason = budgetReason(self.expanded, self.maxNodes, self.deadline, self.maxMemory)
+            if self.reason is not None:
+                return True
+            self.nextCheck = nextBudgetCheck(self.expanded, self.maxNodes)
+        self.expanded += 1
+        return False
+
+    def result(self, nodesExpanded):
+        state, h, actions = self.best
+        return BudgetExhausted(self.reason, nodesExpanded, [], state, h, actions)
+
+
+def budgetResult(reason, nodesExpanded, node, states, parents, moves, costs, hValues):
+    """
+        Builds the BudgetExhausted result from the node table, picking the
+        node with the lowest heuristic value (then the lowest cost), or node
+        itself when the search has no heuristic values.
+    """
+    bestH = None
+    if hValues:
+        node = min(range(len(hValues)), key=lambda candidate: (hValues[candidate], costs[candidate]))
+        bestH = hValues[node]
+    return BudgetExhausted(reason, nodesExpanded, generatedPath(states, parents, moves),
+                           states[node], bestH, reconstructActions(parents, moves, node))
+
+
+def recordStats(stats, nodesExpanded, generated, suppressed, decreased, peakFrontier, exploredSize, sampled):
+    "Adds the final counters of one generic_search run to stats"
+    stats['nodesExpanded'] += nodesExpanded
+    stats['successorsGenerated'] += generated
+    stats['suppressedPushes'] += suppressed
+    stats['decreasedKeys'] += decreased
+    stats['peakFrontier'] = max(stats['peakFrontier'], peakFrontier)
+    stats['exploredSize'] += exploredSize
+    stats['sampledExpansions'] += sampled
+
+
+def reconstructActions(parents, moves, node):
+    """
+        Walks the parent pointers back from node to the root and returns the
+        actions that lead from the start state to it.
+    """
+    actions = []
+    while parents[node] != -1:
+        actions.append(moves[node])
+        node = parents[node]
+    actions.reverse()
+    return actions
+
+
+def generatedPath(states, parents, moves):
+    """
+        Rebuilds the (state, action) log of every generated successor, in the
+        order they were pushed, from the node table.
+    """
+    return [(states[parents[node]], moves[node]) for node in range(1, len(states))]
+
+
+def breadthFirstSearch(problem, stats=None, **budgets):
     """
     This function implements the Breadth First Search Algorithm
     """
-    return generic_search(problem, strategy="BFS")
+    return generic_search(problem, strategy="BFS", stats=stats, **budgets)
 
-def depthFirstSearch(problem):
+def depthFirstSearch(problem, stats=None, **budgets):
     """
         This function implements the Depth First Search Algorithm
     """
-    return generic_search(problem, strategy="DFS")
+    return generic_search(problem, strategy="DFS", stats=stats, **budgets)
 
-def uniformCostSearch(problem):
+def uniformCostSearch(problem, stats=None, **budgets):
     """
         This function implements the Uniform Cost Search Algorithm
     """
-    return generic_search(problem, strategy="UCS", use_cost=True)
+    return generic_search(problem, strategy="UCS", use_cost=True, stats=stats, **budgets)
 
-def aStarSearch(problem, heuristic):
+def aStarSearch(problem, heuristic, stats=None, **budgets):
     """
         This function implements the A* Search Algorithm
         The function also takes in a heuristic depending on the input
     """
-    return generic_search(problem, strategy="A*", use_cost=True, heuristic=heuristic)
+    return generic_search(problem, strategy="A*", use_cost=True, heuristic=heuristic, stats=stats, **budgets)
 
-def greedyBestFirstSearch(problem, heuristic):
+def greedyBestFirstSearch(problem, heuristic, stats=None, **budgets):
     """
         This function implements the A* Search Algorithm
         The function also takes in a heuristic depending on the input
     """
-    return generic_search(problem, strategy="GBS", use_cost=True, heuristic=heuristic)
+    return generic_search(problem, strategy="GBS", use_cost=True, heuristic=heuristic, stats=stats, **budgets)
+
+DEFAULT_WEIGHT = 2.0
+
+def weightedAStarSearch(problem, heuristic, weight=DEFAULT_WEIGHT, stats=None, **budgets):
+    """
+        This function implements Weighted A* Search: A* ordered by
+        f = g + weight * h, trading solution cost (at most weight times the
+        optimum for an admissible heuristic) for far fewer expansions
+    """
+    if weight < 1:
+        raise ValueError(f"Weighted A* needs a weight of at least 1, got {weight}")
+    return generic_search(problem, strategy="A*", use_cost=True, heuristic=heuristic, stats=stats,
+                          weight=weight, **budgets)
+
+
+class AnytimeResult(tuple):
+    """
+        One solution yielded by anytimeAStarSearch.
+
+        It unpacks like any result, as (actions, nodesExpanded, path, depth),
+        and adds:
+
+          cost      the solution cost
+          weight    the heuristic weight of the pass that produced it
+          bound     its suboptimality bound: cost <= bound * optimal cost
+          elapsed   seconds since the search started
+          history   (cost, weight, bound, nodesExpanded, elapsed) of every
+                    solution yielded so far, this one included
+          reason    None, or the budget that stopped the search after this
+                    solution was found (set by the caller, see
+                    anytimeAStarSearch)
+    """
+    def __new__(cls, actions, nodesExpanded, path, cost, weight, bound, elapsed, history, reason=None):
+        result = super().__new__(cls, (actions, nodesExpanded, path, len(actions)))
+        result.reason = reason
+        result.cost = cost
+        result.weight = weight
+        result.bound = bound
+        result.elapsed = elapsed
+        result.history = history
+        return result
+
+
+def anytimeAStarSearch(problem, heuristic, weight=3.0, decrement=0.5,
+                       max_nodes=None, max_seconds=None, max_memory=None):
+    """
+        This function implements ARA* (Anytime Repairing A*)
+
+        A generator that runs weighted A* passes with the weight lowered by
+        decrement after every pass, down to 1.  Each pass keeps the search
+        tree of the previous ones: states whose cost improved after they
+        were expanded are collected as inconsistent and reopened by the
+        next pass instead of searching again from scratch.
+
+        After every pass an AnytimeResult is yielded with the best solution
+        so far and its bound, the solution cost over the smallest g + h of
+        any open or inconsistent state.  The generator stops once the bound
+        reaches 1 (the solution is optimal), when the state space is
+        exhausted, or when one of the max_nodes / max_seconds / max_memory
+        budgets runs out (see generic_search), so the caller keeps the last
+        result it received.  When a budget stopped it, the generator returns
+        (as StopIteration.value) a BudgetExhausted result with the generated
+        state of lowest heuristic value; otherwise it returns None.
+    """
+    if weight < 1:
+        raise ValueError(f"ARA* needs a starting weight of at least 1, got {weight}")
+    if decrement <= 0:
+        raise ValueError(f"ARA* needs a positive weight decrement, got {decrement}")
+    if heuristic is None:
+        heuristic = nullHeuristic
+    startTime = time.perf_counter()
+    clock = BudgetClock.forBudgets(max_nodes, max_seconds, max_memory)
+
+    start = problem.getStartState()
+    costs = {start: 0}              # Best known g of every generated state
+    parents = {start: (None, None)} # state -> (parent state, action) of that path
+    hValues = {start: heuristic(start, problem)}
+    frontier = util.PriorityQueue() # OPEN, keyed by g + weight * h
+    frontier.push(start, weight * hValues[start])
+    closed = set()                  # Expanded during the current pass
+    inconsistent = set()            # Improved after being expanded in this pass
+    goal = start if problem.isGoalState(start) else None
+    bestState = start               # Generated state with the lowest h, reported if a budget runs out
+    history = []
+    nodesExpanded = 0
+
+    while True:
+        # Expands until no open state's key is below the incumbent's cost
+        while not frontier.isEmpty() and (goal is None or costs[goal] > frontier.peekPriority()):
+            state = frontier.pop()
+            if state in closed:     # Stale entry of a state already expanded this pass
+                continue
+            if clock is not None and clock.exhausted():
+                clock.best = (bestState, hValues[bestState], anytimePath(parents, bestState)[0])
+                return clock.result(nodesExpanded)
+            closed.add(state)
+            nodesExpanded += 1
+            for (succ, action, stepCost) in problem.getSuccessors(state):
+                newCost = costs[state] + stepCost
+                if newCost >= costs.get(succ, float('inf')):
+                    continue
+                costs[succ] = newCost
+                parents[succ] = (state, action)
+                if succ not in hValues:
+                    hValues[succ] = heuristic(succ, problem)
+                    if hValues[succ] < hValues[bestState]:
+                        bestState = succ
+                if problem.isGoalState(succ) and (goal is None or newCost < costs[goal]):
+                    goal = succ
+                if succ in closed:
+                    inconsistent.add(succ)
+                else:
+                    frontier.push(succ, newCost + weight * hValues[succ])
+
+        if goal is None:        # Nothing left to expand and no goal reached
+            return
+
+        # Parent pointers may have been improved since costs[goal] was set,
+        # so the path can be cheaper than that; its own cost is reported
+        actions, path = anytimePath(parents, goal)
+        cost = problem.getCostOfActions(actions)
+        pending = [entry[2] for entry in frontier.heap] + list(inconsistent)
+        lowest = min((costs[state] + hValues[state] for state in pending), default=cost)
+        bound = min(weight, cost / lowest) if lowest > 0 else 1.0
+        elapsed = time.perf_counter() - startTime
+        history.append((cost, weight, bound, nodesExpanded, elapsed))
+        yield AnytimeResult(actions, nodesExpanded, path, cost, weight, bound, elapsed, list(history))
+        if bound <= 1 or weight <= 1:
+            return
+
+        # Next pass: lower the weight, reopen the inconsistent states and rekey OPEN
+        weight = max(1, weight - decrement)
+        reopened = util.PriorityQueue()
+        for state in pending:
+            reopened.push(state, costs[state] + weight * hValues[state])
+        frontier = reopened
+        inconsistent = set()
+        closed = set()
+
+
+def anytimePath(parents, goal):
+    """
+        Follows the parent pointers back from goal and returns the actions
+        and the (state, action) solution path.
+    """
+    actions = []
+    path = [(goal, "Goal Reached")]
+    state, action = parents[goal]
+    while state is not None:
+        actions.append(action)
+        path.append((state, action))
+        state, action = parents[state]
+    actions.reverse()
+    path.reverse()
+    return actions, path
+
+class StateBoard:
+    """
+        Board interface over the immutable states of any SearchProblem.
+
+        Depth-first engines walk one board with apply(move) / undo(move).
+        Problems that can do this in place provide getStartBoard(); for the
+        rest this adapter keeps the current path as a stack of states and
+        remembers the successors of every state on it, so apply is a lookup.
+    """
+    def __init__(self, problem):
+        self.problem = problem
+        self.states = [problem.getStartState()]
+        self.children = []      # children[d]: action -> successor of states[d]
+
+    def key(self):
+        return self.states[-1]
+
+    def moves(self):
+        depth = len(self.states) - 1
+        successors = self.problem.getSuccessors(self.states[depth])
+        del self.children[depth:]
+        self.children.append({action: succ for (succ, action, stepCost) in successors})
+        return [(action, stepCost) for (succ, action, stepCost) in successors]
+
+    def apply(self, move):
+        self.states.append(self.children[len(self.states) - 1][move])
+
+    def undo(self, move):
+        self.states.pop()
+
+    def isGoal(self):
+        return self.problem.isGoalState(self.states[-1])
+
+    def view(self):
+        return self.states[-1]
+
+    def snapshot(self):
+        return self.states[-1]
+
+
+def startBoard(problem):
+    "The problem's in-place board if it has one, else a StateBoard"
+    if hasattr(problem, 'getStartBoard'):
+        return problem.getStartBoard()
+    return StateBoard(problem)
+
+
+def boardPath(board, actions):
+    """
+        Materialises the (state, action) solution path from a board left at
+        the goal by undoing actions; the board ends back at the start.
+    """
+    path = [(board.snapshot(), "Goal Reached")]
+    for action in reversed(actions):
+        board.undo(action)
+        path.append((board.snapshot(), action))
+    path.reverse()
+    return path
+
+
+def boundedDepthFirst(problem, limit, clock=None):
+    """
+        Depth-first search from the start state that follows paths of at most
+        limit actions.  Cycles are detected only along the current path, so
+        memory is linear in limit.  The search walks a single board in place
+        (see startBoard) instead of building a state per node.
+
+        Returns (found, cutoff, actions, path, nodesExpanded): cutoff tells
+        whether some path was cut at the limit, i.e. whether a deeper search
+        could still succeed.  path is the (state, action) solution path, or
+        [] when nothing was found.  With a BudgetClock the search stops, not
+        found and not cut off, once a budget runs out; clock.best is then the
+        board it was about to expand.
+    """
+    board = startBoard(problem)
+    onPath = {board.key()}  # Keys of the boards on the current path
+    actions = []
+    nodesExpanded = 0
+    cutoff = False
+
+    def search(depth):
+        nonlocal nodesExpanded, cutoff
+        if board.isGoal():
+            return True
+        if depth == limit:
+            cutoff = True
+            return False
+        if clock is not None and clock.exhausted():
+            clock.best = (board.snapshot(), None, list(actions))
+            return True
+        nodesExpanded += 1
+        for (action, stepCost) in board.moves():
+            board.apply(action)
+            key = board.key()
+            if key not in onPath:   # Path-only cycle detection
+                onPath.add(key)
+                actions.append(action)
+                if search(depth + 1):
+                    return True
+                onPath.discard(key)
+                actions.pop()
+            board.undo(action)
+        return False
+
+    found = search(0)
+    if clock is not None and clock.reason is not None:
+        return False, False, actions, [], nodesExpanded
+    path = boardPath(board, actions) if found else []
+    return found, cutoff, actions, path, nodesExpanded
+
+
+def depthLimitedSearch(problem, limit, **budgets):
+    """
+        This function implements Depth Limited Search: depth-first search
+        without a closed list that gives up on paths longer than limit.
+    """
+    clock = BudgetClock.forBudgets(**budgets)
+    found, cutoff, actions, path, nodesExpanded = boundedDepthFirst(problem, limit, clock)
+    if clock is not None and clock.reason is not None:
+        return clock.result(nodesExpanded)
+    if not found:
+        return [], nodesExpanded, [], 0
+    return actions, nodesExpanded, path, len(actions)
+
+
+def iterativeDeepeningSearch(problem, iterations=None, **budgets):
+    """
+        This function implements Iterative Deepening Depth First Search
+
+        Runs depthLimitedSearch with limits 0, 1, 2, ... so it returns a
+        solution with the fewest actions while using memory linear in its
+        depth.  If iterations is a list, (limit, nodesExpanded) is appended
+        to it for every iteration.  budgets are generic_search's max_nodes /
+        max_seconds / max_memory, counted over all the iterations.
+    """
+    clock = BudgetClock.forBudgets(**budgets)
+    nodesExpanded = 0
+    limit = 0
+    while True:
+        found, cutoff, actions, path, expanded = boundedDepthFirst(problem, limit, clock)
+        nodesExpanded += expanded
+        if iterations is not None:
+            iterations.append((limit, expanded))
+        if clock is not None and clock.reason is not None:
+            return clock.result(nodesExpanded)
+        if found:
+            return actions, nodesExpanded, path, len(actions)
+        if not cutoff:      # Every path ended before the limit: no solution
+            return [], nodesExpanded, [], 0
+        limit += 1
+
+
+def idaStarSearch(problem, heuristic, iterations=None, **budgets):
+    """
+        This function implements the Iterative Deepening A* Search Algorithm
+
+        Repeats a depth-first search bounded by f = g + h, raising the bound to
+        the smallest f that exceeded it, so memory stays linear in the depth.
+        Successors that undo the previous move are pruned.  Like
+        boundedDepthFirst it walks a single in-place board.  If iterations is a
+        list, (bound, nodesExpanded) is appended to it for every iteration.
+        budgets are generic_search's max_nodes / max_seconds / max_memory,
+        counted over all the iterations; the best partial state reported
+        when one runs out is the one with the lowest heuristic value.
+
+        Without budgets the search does not terminate on problems without a
+        solution.
+    """
+    if heuristic is None:
+        heuristic = nullHeuristic
+    delta = getattr(heuristic, 'delta', None)
+
+    board = startBoard(problem)
+    keys = [board.key()]    # Keys of the boards on the current path, root first
+    actions = []            # Actions taken along the current path
+    nodesExpanded = 0
+    clock = BudgetClock.forBudgets(**budgets)
+
+    def boundedSearch(g, h, bound):
+        # Returns None once the goal is found, else the smallest f over the bound
+        nonlocal nodesExpanded
+        f = g + h
+        if f > bound:
+            return f
+        if board.isGoal():
+            return None
+        if clock is not None:
+            if h < clock.best[1]:
+                clock.best = (board.snapshot(), h, list(actions))
+            if clock.exhausted():
+                return None     # Unwinds like a found goal; clock.reason tells them apart
+        nodesExpanded += 1
+
+        previous = keys[-2] if len(keys) > 1 else None
+        smallest = float('inf')
+        for (action, stepCost) in board.moves():
+            board.apply(action)
+            key = board.key()
+            if key != previous:         # Move-reversal pruning
+                succ = board.view()
+                succH = delta(h, succ, action) if delta is not None else heuristic(succ, problem)
+                keys.append(key)
+                actions.append(action)
+                exceeded = boundedSearch(g + stepCost, succH, bound)
+                if exceeded is None:
+                    return None
+                smallest = min(smallest, exceeded)
+                keys.pop()
+                actions.pop()
+            board.undo(action)
+        return smallest
+
+    startH = heuristic(board.view(), problem)
+    if clock is not None:
+        clock.best = (board.snapshot(), startH, [])
+    bound = startH
+    while True:
+        before = nodesExpanded
+        exceeded = boundedSearch(0, startH, bound)
+        if iterations is not None:
+            iterations.append((bound, nodesExpanded - before))
+        if clock is not None and clock.reason is not None:
+            return clock.result(nodesExpanded)
+        if exceeded is None:
+            return list(actions), nodesExpanded, boardPath(board, actions), len(actions)
+        if exceeded == float('inf'):
+            return [], nodesExpanded, [], 0
+        bound = exceeded
+
+def joinPaths(forwardParents, backwardParents, meet):
+    """
+        Joins the two half-paths of a bidirectional search at the state meet.
+
+        forwardParents maps a state to (parent, action from parent); backward
+        Parents maps a state to (next state towards the goal, action to it).
+        Returns the actions and the (state, action) solution path.
+    """
+    path = []
+    state = meet
+    while forwardParents[state][0] is not None:
+        parent, action = forwardParents[state][:2]
+        path.append((parent, action))
+        state = parent
+    path.reverse()
+    state = meet
+    while backwardParents[state][0] is not None:
+        nextState, action = backwardParents[state][:2]
+        path.append((state, action))
+        state = nextState
+    actions = [action for _, action in path]
+    path.append((state, "Goal Reached"))
+    return actions, path
+
+
+def bidirectionalBreadthFirstSearch(problem):
+    """
+        This function implements Bidirectional Breadth First Search
+
+        Grows a breadth-first layer from the start and one from the goal,
+        always expanding the smaller of the two, and stops once a layer
+        reaches a state the other side has seen.  The problem must provide
+        getGoalState() and getPredecessors(state), the latter returning
+        (predecessor, action from predecessor, stepCost) triples.
+    """
+    start = problem.getStartState()
+    goal = problem.getGoalState()
+    forwardParents = {start: (None, None, 0)}    # state -> (parent, action, depth)
+    backwardParents = {goal: (None, None, 0)}    # state -> (next state, action, depth)
+    forwardLayer = [start]
+    backwardLayer = [goal]
+    nodesExpanded = 0
+
+    if start == goal:
+        actions, path = joinPaths(forwardParents, backwardParents, start)
+        return actions, nodesExpanded, path, 0
+
+    while forwardLayer and backwardLayer:
+        forward = len(forwardLayer) <= len(backwardLayer)
+        if forward:
+            layer, parents, others = forwardLayer, forwardParents, backwardParents
+        else:
+            layer, parents, others = backwardLayer, backwardParents, forwardParents
+
+        # Expand the whole layer before stopping so the shortest meeting wins
+        nextLayer = []
+        meet, meetLength = None, None
+        for state in layer:
+            nodesExpanded += 1
+            depth = parents[state][2] + 1
+            neighbours = problem.getSuccessors(state) if forward else problem.getPredecessors(state)
+            for (neighbour, action, stepCost) in neighbours:
+                if neighbour in parents:
+                    continue
+                parents[neighbour] = (state, action, depth)
+                nextLayer.append(neighbour)
+                if neighbour in others:
+                    length = depth + others[neighbour][2]
+                    if meet is None or length < meetLength:
+                        meet, meetLength = neighbour, length
+
+        if meet is not None:
+            actions, path = joinPaths(forwardParents, backwardParents, meet)
+            return actions, nodesExpanded, path, len(actions)
+
+        if forward:
+            forwardLayer = nextLayer
+        else:
+            backwardLayer = nextLayer
+
+    return [], nodesExpanded, [], 0
+
+
+def backwardHeuristic(heuristic, problem):
+    """
+        Returns heuristic retargeted to estimate the distance back to the start
+        state.  Heuristics that cannot be retargeted fall back to nullHeuristic.
+    """
+    if heuristic is not None and hasattr(heuristic, 'forGoal'):
+        return heuristic.forGoal(problem.getStartState().numbers())
+    return nullHeuristic
+
+
+def bidirectionalAStarSearch(problem, heuristic):
+    """
+        This function implements front-to-end Bidirectional A* Search
+
+        Runs A* from the start towards the goal and from the goal back towards
+        the start, expanding the side with the smaller frontier.  The best
+        meeting cost found so far is returned once it is no larger than the
+        smallest f on either frontier.  The problem must provide the same
+        getGoalState() and getPredecessors(state) as for the bidirectional BFS.
+    """
+    if heuristic is None:
+        heuristic = nullHeuristic
+    start = problem.getStartState()
+    goal = problem.getGoalState()
+    reverse = backwardHeuristic(heuristic, problem)
+
+    forwardParents = {start: (None, None, 0)}    # state -> (parent, action, g)
+    backwardParents = {goal: (None, None, 0)}    # state -> (next state, action, g)
+    forwardFrontier = [(heuristic(start, problem), 0, start)]
+    backwardFrontier = [(reverse(goal, problem), 0, goal)]
+    forwardClosed = set()
+    backwardClosed = set()
+    count = 1           # Tie-breaker so states themselves are never compared
+    nodesExpanded = 0
+
+    best, meet = float('inf'), None
+    if start == goal:
+        best, meet = 0, start
+
+    while forwardFrontier and backwardFrontier:
+        if max(forwardFrontier[0][0], backwardFrontier[0][0]) >= best:
+            break
+
+        forward = len(forwardFrontier) <= len(backwardFrontier)
+        if forward:
+            frontier, parents, closed, others, h = forwardFrontier, forwardParents, forwardClosed, backwardParents, heuristic
+        else:
+            frontier, parents, closed, others, h = backwardFrontier, backwardParents, backwardClosed, forwardParents, reverse
+
+        _, _, state = heapq.heappop(frontier)
+        if state in closed:
+            continue
+        closed.add(state)
+        nodesExpanded += 1
+
+        g = parents[state][2]
+        neighbours = problem.getSuccessors(state) if forward else problem.getPredecessors(state)
+        for (neighbour, action, stepCost) in neighbours:
+            newCost = g + stepCost
+            if neighbour in parents and parents[neighbour][2] <= newCost:
+                continue
+            parents[neighbour] = (state, action, newCost)
+            heapq.heappush(frontier, (newCost + h(neighbour, problem), count, neighbour))
+            count += 1
+            if neighbour in others and newCost + others[neighbour][2] < best:
+                best, meet = newCost + others[neighbour][2], neighbour
+
+    if meet is None:
+        return [], nodesExpanded, [], 0
+    actions, path = joinPaths(forwardParents, backwardParents, meet)
+    return actions, nodesExpanded, path, len(actions)
+
 
 def nullHeuristic(state, problem=None):
     return 0
 
 
+DEFAULT_GOAL = [1, 2, 3, 8, 0, 4, 7, 6, 5]
+
+
+class TableHeuristic:
+    """
+        A heuristic that sums a precomputed (tile x position) cost table over
+        the board.  table[tile][position] is the cost contributed by tile when
+        it sits in the row-major cell position; the blank's row is all zeros.
+        builder, if given, is the goal -> table function used by forGoal().
+
+        Instances are called like any other heuristic: heuristic(state, problem).
+        Since a move relocates exactly one tile, delta() derives a child's value
+        from its parent's in O(1).
+    """
+    integral = True     # Values are integers, so generic_search may use a bucket queue
+
+    def __init__(self, table, builder=None):
+        self.table = table
+        self.builder = builder
+        self.cells = len(table[0])
+        size = int(round(self.cells ** 0.5))
+        self.offsets = {'up': -size, 'down': size, 'left': -1, 'right': 1}
+
+    def __call__(self, state, problem=None):
+        table = self.table
+        packed = state.packed
+        value = 0
+        for position in range(self.cells):
+            value += table[packed & 0xF][position]
+            packed >>= 4
+        return value
+
+    def delta(self, parentH, state, move):
+        """
+            Returns the heuristic of state, the successor reached by move,
+            given its parent's value parentH.  The tile that moved now sits
+            where the parent's blank was and used to sit on state's blank.
+        """
+        parentBlank = state.blank - self.offsets[move]
+        tile = (state.packed >> (4 * parentBlank)) & 0xF
+        row = self.table[tile]
+        return parentH + row[parentBlank] - row[state.blank]
+
+    def forGoal(self, goal):
+        "Returns the same kind of heuristic built for another flat goal list"
+        return TableHeuristic(self.builder(goal), self.builder)
+
+
+def goalPositions(goal):
+    """
+        Maps each tile of the flat goal list to its row-major cell index.
+    """
+    positions = [0] * len(goal)
+    for position, tile in enumerate(goal):
+        positions[tile] = position
+    return positions
+
+
+def manhattanTable(goal):
+    """
+        Builds the (tile x position) Manhattan distance table for goal.
+    """
+    cells = len(goal)
+    size = int(round(cells ** 0.5))
+    positions = goalPositions(goal)
+    table = [[0] * cells for _ in range(cells)]
+    for tile in range(1, cells):
+        target = divmod(positions[tile], size)
+        for position in range(cells):
+            table[tile][position] = util.manhattanDistance(divmod(position, size), target)
+    return table
+
+
+def misplacedTable(goal):
+    """
+        Builds the (tile x position) misplaced-tile table for goal.
+    """
+    cells = len(goal)
+    positions = goalPositions(goal)
+    table = [[0] * cells for _ in range(cells)]
+    for tile in range(1, cells):
+        for position in range(cells):
+            table[tile][position] = 0 if positions[tile] == position else 1
+    return table
+
+
+def manhattanHeuristic(goal=DEFAULT_GOAL):
+    """
+        Returns a Manhattan distance heuristic for the flat goal list.
+    """
+    return TableHeuristic(manhattanTable(goal), manhattanTable)
+
+
+def misplacedHeuristic(goal=DEFAULT_GOAL):
+    """
+        Returns a misplaced-tile heuristic for the flat goal list.
+    """
+    return TableHeuristic(misplacedTable(goal), misplacedTable)
+
+
+def longestIncreasing(values):
+    """
+        Length of the longest strictly increasing subsequence of values.
+    """
+    lengths = []
+    for index, value in enumerate(values):
+        lengths.append(1 + max([lengths[earlier] for earlier in range(index) if values[earlier] < value], default=0))
+    return max(lengths, default=0)
+
+
+def conflictTables(goal, axis):
+    """
+        Builds the linear-conflict tables of goal for its rows (axis 0) or
+        columns (axis 1).  tables[line][key] is the number of extra moves
+        forced inside that line, where key packs the line's tiles 4 bits
+        each, first cell lowest.
+
+        Tiles of the line whose goal is also in the line must keep their
+        goal order.  Every tile that has to leave the line to fix the order
+        costs two moves beyond its Manhattan distance, and at least
+        count - longestIncreasing of them must leave.
+    """
+    cells = len(goal)
+    size = int(round(cells ** 0.5))
+    positions = goalPositions(goal)
+    tables = []
+    for line in range(size):
+        table = bytearray(1 << (4 * size))
+        for tiles in itertools.permutations(range(cells), size):
+            targets = []
+            for tile in tiles:
+                lineOf, offset = divmod(positions[tile], size)
+                if axis == 1:
+                    lineOf, offset = offset, lineOf
+                if tile != 0 and lineOf == line:
+                    targets.append(offset)
+            key = 0
+            for index, tile in enumerate(tiles):
+                key |= tile << (4 * index)
+            table[key] = 2 * (len(targets) - longestIncreasing(targets))
+        tables.append(table)
+    return tables
+
+
+class LinearConflictHeuristic:
+    """
+        Manhattan distance plus two moves for every tile that must leave its
+        row or column to let another tile of the same line past it.
+
+        The conflicts of each row and column are read from tables precomputed
+        by conflictTables, so an evaluation costs the Manhattan sum plus one
+        lookup per line.  Values are never below Manhattan distance and are
+        still admissible.
+    """
+    integral = True
+
+    def __init__(self, goal):
+        self.manhattan = manhattanHeuristic(goal)
+        self.size = int(round(len(goal) ** 0.5))
+        self.rowTables = conflictTables(goal, 0)
+        self.columnTables = conflictTables(goal, 1)
+        # Bit offsets of each column's cells, last row first
+        self.columnShifts = [[4 * (row * self.size + column) for row in reversed(range(self.size))]
+                             for column in range(self.size)]
+
+    def __call__(self, state, problem=None):
+        packed = state.packed
+        value = self.manhattan(state)
+        width = 4 * self.size
+        mask = (1 << width) - 1
+        rows = packed
+        for table in self.rowTables:
+            value += table[rows & mask]
+            rows >>= width
+        for table, shifts in zip(self.columnTables, self.columnShifts):
+            key = 0
+            for shift in shifts:
+                key = (key << 4) | ((packed >> shift) & 0xF)
+            value += table[key]
+        return value
+
+    def forGoal(self, goal):
+        "Returns the same heuristic built for another flat goal list"
+        return LinearConflictHeuristic(goal)
+
+
+def walkingDistanceTable(goal, axis):
+    """
+        Runs a breadth-first search from goal over the walking-distance
+        abstraction along rows (axis 0) or columns (axis 1) and returns the
+        distance of every reachable abstract state.
+
+        An abstract state records, for every line, how many of its tiles
+        belong to each goal line, plus the line of the blank, as a flat
+        tuple.  A move swaps the blank with one tile of a neighbouring line.
+    """
+    cells = len(goal)
+    size = int(round(cells ** 0.5))
+    positions = goalPositions(goal)
+    start = [0] * (size * size + 1)
+    for position, tile in enumerate(goal):
+        line = divmod(position, size)[axis]
+        if tile == 0:
+            start[-1] = line
+        else:
+            start[line * size + divmod(positions[tile], size)[axis]] += 1
+    start = tuple(start)
+
+    distances = {start: 0}
+    layer = [start]
+    distance = 0
+    while layer:
+        distance += 1
+        nextLayer = []
+        for key in layer:
+            blank = key[-1]
+            for other in (blank - 1, blank + 1):
+                if not 0 <= other < size:
+                    continue
+                for target in range(size):
+                    if key[other * size + target]:
+                        child = list(key)
+                        child[other * size + target] -= 1
+                        child[blank * size + target] += 1
+                        child[-1] = other
+                        child = tuple(child)
+                        if child not in distances:
+                            distances[child] = distance
+                            nextLayer.append(child)
+        layer = nextLayer
+    return distances
+
+
+class WalkingDistanceHeuristic:
+    """
+        Sum of the vertical and horizontal walking distances.
+
+        The vertical walking distance is the exact number of moves needed
+        when only the goal row of every tile is known, i.e. the distance in
+        walkingDistanceTable along rows; the horizontal one is the same
+        along columns.  Each move changes only one of the two, so the sum is
+        admissible, and it also accounts for tiles blocking each other.
+    """
+    integral = True
+
+    def __init__(self, goal):
+        cells = len(goal)
+        self.size = int(round(cells ** 0.5))
+        positions = goalPositions(goal)
+        self.goalRows = [positions[tile] // self.size for tile in range(cells)]
+        self.goalColumns = [positions[tile] % self.size for tile in range(cells)]
+        self.verticalTable = walkingDistanceTable(goal, 0)
+        self.horizontalTable = walkingDistanceTable(goal, 1)
+
+    def __call__(self, state, problem=None):
+        size = self.size
+        vertical = [0] * (size * size + 1)
+        horizontal = [0] * (size * size + 1)
+        packed = state.packed
+        for position in range(size * size):
+            tile = packed & 0xF
+            packed >>= 4
+            row, column = divmod(position, size)
+            if tile == 0:
+                vertical[-1] = row
+                horizontal[-1] = column
+            else:
+                vertical[row * size + self.goalRows[tile]] += 1
+                horizontal[column * size + self.goalColumns[tile]] += 1
+        return self.verticalTable[tuple(vertical)] + self.horizontalTable[tuple(horizontal)]
+
+    def forGoal(self, goal):
+        "Returns the same heuristic built for another flat goal list"
+        return WalkingDistanceHeuristic(goal)
+
+
+def linearConflictHeuristic(goal=DEFAULT_GOAL):
+    """
+        Returns a linear-conflict heuristic for the flat goal list.
+    """
+    return LinearConflictHeuristic(goal)
+
+
+def walkingDistanceHeuristic(goal=DEFAULT_GOAL):
+    """
+        Returns a walking-distance heuristic for the flat goal list.
+    """
+    return WalkingDistanceHeuristic(goal)
+
+
+goalHeuristics = {}     # Heuristics built by heuristicForProblem, keyed by (factory, goal)
+
+
+def heuristicForProblem(factory, problem):
+    """
+        Returns the heuristic built by factory for the problem's goal, building
+        it on first use.  Problems without a goal use DEFAULT_GOAL.
+    """
+    goal = getattr(problem, 'goal', None)
+    key = (factory, goal)
+    if key not in goalHeuristics:
+        goalHeuristics[key] = factory(goal.numbers() if goal is not None else DEFAULT_GOAL)
+    return goalHeuristics[key]
+
+
 def misplacedTile(state, problem):
     """
         Heuristic function to count the number of misplaces tiles
     """
-    goal = [[1, 2, 3], [8, None, 4], [7, 6, 5]]
-    misplaced = 0
-    for i in range(3):
-        for j in range(3):
-            if state.cells[i][j] != goal[i][j] and state.cells[i][j] is not None:
-                misplaced += 1
-
-    return misplaced
+    return heuristicForProblem(misplacedHeuristic, problem)(state, problem)
 
 
 def manhattanDistance(state, problem):
     """
         Heuristic function to calculate the manhattan Distance
     """
-    goal_positions = {1: (0, 0), 2: (0, 1), 3: (0, 2), 8: (1, 0), None: (1, 1), 4: (1, 2), 7: (2, 0), 6: (2, 1), 5: (2, 2)}
-    distance = 0
+    return heuristicForProblem(manhattanHeuristic, problem)(state, problem)
+
+
+def linearConflict(state, problem):
+    """
+        Heuristic function adding linear conflicts to the manhattan Distance
+    """
+    return heuristicForProblem(linearConflictHeuristic, problem)(state, problem)
+
+
+def walkingDistance(state, problem):
+    """
+        Heuristic function to calculate the walking distance
+    """
+    return heuristicForProblem(walkingDistanceHeuristic, problem)(state, problem)
 
-    for i in range(3):
-        for j in range(3):
-            tile = state.cells[i][j]
-            if tile is not None and tile != 0:
-                goal_i, goal_j = goal_positions[tile]
-                distance += util.manhattanDistance((i, j), (goal_i, goal_j))
 
-    return distance
+misplacedTile.integral = True
+manhattanDistance.integral = True
+linearConflict.integral = True
+walkingDistance.integral = True
 
 
 # Abbreviations
 bfs = breadthFirstSearch
+idastar = idaStarSearch
+dls = depthLimitedSearch
+iddfs = iterativeDeepeningSearch
+bibfs = bidirectionalBreadthFirstSearch
+biastar = bidirectionalAStarSearch
 dfs = depthFirstSearch
 gbfs = greedyBestFirstSearch
 astar = aStarSearch
+wastar = weightedAStarSearch
+arastar = anytimeAStarSearch
 ucs = uniformCostSearch
\ No newline at end of file
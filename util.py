@@ -26,8 +26,10 @@
 # Pieter Abbeel (pabbeel@cs.berkeley.edu).
 
 
+import os
 import sys
 import inspect
+import collections
 import heapq, random
 
 
@@ -147,63 +149,285 @@ class Stack:
         "Returns true if the stack is empty"
         return len(self.list) == 0
 
+    def __len__(self):
+        return len(self.list)
+
 class Queue:
     "A container with a first-in-first-out (FIFO) queuing policy."
     def __init__(self):
-        self.list = []
+        self.list = collections.deque()
 
     def push(self,item):
         "Enqueue the 'item' into the queue"
-        self.list.insert(0,item)
+        self.list.append(item)
 
     def pop(self):
         """
           Dequeue the earliest enqueued item still in the queue. This
           operation removes the item from the queue.
         """
-        return self.list.pop()
+        return self.list.popleft()
 
     def isEmpty(self):
         "Returns true if the queue is empty"
         return len(self.list) == 0
 
+    def __len__(self):
+        return len(self.list)
+
+class BitSet:
+    """
+      A set stored as one bit per possible item in a bytearray.  Every item
+      is mapped by indexFunction to a distinct integer in [0, size), so
+      membership tests and insertions are single bit operations.  The index
+      of the last item looked up is remembered, so testing an item and then
+      adding it computes its index once.
+
+    >>> bits = BitSet(10, lambda item: item)
+    >>> bits.add(3)
+    >>> 3 in bits, 4 in bits, len(bits)
+    (True, False, 1)
+    """
+    def __init__(self, size, indexFunction):
+        self.bits = bytearray((size + 7) // 8)
+        self.indexFunction = indexFunction
+        self.count = 0
+        self.lastItem = None    # Item of the last index computed, and its index
+        self.lastIndex = None
+
+    def index(self, item):
+        "Returns the index of 'item', reusing the last one computed"
+        if item is not self.lastItem:
+            self.lastItem = item
+            self.lastIndex = self.indexFunction(item)
+        return self.lastIndex
+
+    def add(self, item):
+        "Adds 'item' to the set"
+        index = self.index(item)
+        mask = 1 << (index & 7)
+        if not self.bits[index >> 3] & mask:
+            self.bits[index >> 3] |= mask
+            self.count += 1
+
+    def __contains__(self, item):
+        index = self.index(item)
+        return bool(self.bits[index >> 3] & (1 << (index & 7)))
+
+    def __len__(self):
+        return self.count
+
 class PriorityQueue:
     """
       Implements a priority queue data structure. Each inserted item
       has a priority associated with it and the client is usually interested
       in quick retrieval of the lowest-priority item in the queue. This
       data structure allows O(1) access to the lowest-priority item.
+
+      The binary heap is indexed: a handle map records the heap slot of
+      every item, so contains() is O(1) and update() is a true O(log n)
+      decrease-key.  Items must be hashable and are held at most once;
+      pushing an item already in the queue behaves like update().
+
+    >>> queue = PriorityQueue()
+    >>> queue.push('a', 3)
+    >>> queue.push('b', 1)
+    >>> queue.push('c', 3)
+    >>> queue.push('d', 2)
+    >>> 'c' in queue, queue.contains('z'), len(queue)
+    (True, False, 4)
+
+    update() and a repeated push() only ever lower a priority, and items
+    of equal priority come out in the order they were first pushed:
+
+    >>> queue.update('c', 0)
+    >>> queue.push('a', 5)
+    >>> queue.update('d', 1)
+    >>> queue.peekPriority()
+    0
+    >>> [queue.pop() for _ in range(4)], queue.isEmpty()
+    (['c', 'b', 'd', 'a'], True)
     """
     def  __init__(self):
-        self.heap = []
+        self.heap = []      # Entries [priority, count, item]; count breaks ties in FIFO order
+        self.index = {}     # item -> slot of its entry in self.heap
         self.count = 0
 
     def push(self, item, priority):
-        entry = (priority, self.count, item)
-        heapq.heappush(self.heap, entry)
+        if item in self.index:
+            self.update(item, priority)
+            return
+        self.heap.append([priority, self.count, item])
         self.count += 1
+        self.index[item] = len(self.heap) - 1
+        self.siftUp(len(self.heap) - 1)
 
     def pop(self):
-        (_, _, item) = heapq.heappop(self.heap)
-        return item
+        heap = self.heap
+        last = heap.pop()
+        if heap:
+            top = heap[0]
+            heap[0] = last
+            self.index[last[2]] = 0
+            self.siftDown(0)
+        else:
+            top = last
+        del self.index[top[2]]
+        return top[2]
 
     def isEmpty(self):
         return len(self.heap) == 0
 
+    def peekPriority(self):
+        "Returns the lowest priority in the queue without removing its item"
+        return self.heap[0][0]
+
+    def contains(self, item):
+        "Returns true if 'item' is waiting in the queue"
+        return item in self.index
+
+    __contains__ = contains
+
+    def __len__(self):
+        return len(self.heap)
+
     def update(self, item, priority):
-        # If item already in priority queue with higher priority, update its priority and rebuild the heap.
+        # If item already in priority queue with higher priority, lower its priority and sift it up.
         # If item already in priority queue with equal or lower priority, do nothing.
         # If item not in priority queue, do the same thing as self.push.
-        for index, (p, c, i) in enumerate(self.heap):
-            if i == item:
-                if p <= priority:
-                    break
-                del self.heap[index]
-                self.heap.append((priority, c, item))
-                heapq.heapify(self.heap)
-                break
-        else:
+        slot = self.index.get(item)
+        if slot is None:
             self.push(item, priority)
+            return
+        entry = self.heap[slot]
+        if entry[0] <= priority:
+            return
+        entry[0] = priority
+        self.siftUp(slot)
+
+    def siftUp(self, slot):
+        heap, index = self.heap, self.index
+        entry = heap[slot]
+        key = (entry[0], entry[1])
+        while slot > 0:
+            parentSlot = (slot - 1) >> 1
+            parent = heap[parentSlot]
+            if (parent[0], parent[1]) <= key:
+                break
+            heap[slot] = parent
+            index[parent[2]] = slot
+            slot = parentSlot
+        heap[slot] = entry
+        index[entry[2]] = slot
+
+    def siftDown(self, slot):
+        heap, index = self.heap, self.index
+        size = len(heap)
+        entry = heap[slot]
+        key = (entry[0], entry[1])
+        while True:
+            child = 2 * slot + 1
+            if child >= size:
+                break
+            right = child + 1
+            if right < size and (heap[right][0], heap[right][1]) < (heap[child][0], heap[child][1]):
+                child = right
+            if key <= (heap[child][0], heap[child][1]):
+                break
+            heap[slot] = heap[child]
+            index[heap[slot][2]] = slot
+            slot = child
+        heap[slot] = entry
+        index[entry[2]] = slot
+
+class BucketQueue:
+    """
+      A priority queue for small non-negative integer priorities, such as
+      f = g + h in unit-cost puzzles.  It keeps one bucket per priority,
+      split by depth (usually g), so push and pop are O(1) amortized.
+      Among items of equal priority the deepest is popped first, and among
+      equal depths the most recently pushed (LIFO).
+
+      It offers the same contains()/update() interface as PriorityQueue.
+      update() leaves the old entry in its bucket and pop() skips it later.
+
+    >>> queue = BucketQueue()
+    >>> queue.push('a', 2, 0)
+    >>> queue.push('b', 2, 1)
+    >>> queue.push('c', 1)
+    >>> queue.push('d', 2, 1)
+    >>> queue.update('a', 0)
+    >>> queue.update('b', 5)
+    >>> 'a' in queue, queue.contains('z'), len(queue)
+    (True, False, 4)
+
+    'a' moved to priority 0, leaving a stale entry at priority 2 that is
+    skipped; 'b' kept its lower priority, and 'd' beats it as the later
+    push at the same priority and depth:
+
+    >>> [queue.pop() for _ in range(4)], queue.isEmpty()
+    (['a', 'c', 'd', 'b'], True)
+    """
+    def __init__(self):
+        self.buckets = []   # buckets[priority][depth] -> list of items
+        self.entries = {}   # item -> (priority, depth) of its live entry
+        self.minimum = 0    # No live entry has a smaller priority
+        self.size = 0
+
+    def push(self, item, priority, depth=0):
+        if item in self.entries:
+            self.update(item, priority, depth)
+            return
+        self.insert(item, priority, depth)
+        self.size += 1
+
+    def insert(self, item, priority, depth):
+        buckets = self.buckets
+        while len(buckets) <= priority:
+            buckets.append([])
+        bucket = buckets[priority]
+        while len(bucket) <= depth:
+            bucket.append([])
+        bucket[depth].append(item)
+        self.entries[item] = (priority, depth)
+        if priority < self.minimum:
+            self.minimum = priority
+
+    def pop(self):
+        entries = self.entries
+        while True:
+            bucket = self.buckets[self.minimum]
+            while bucket and not bucket[-1]:
+                bucket.pop()
+            if not bucket:
+                self.minimum += 1
+                continue
+            item = bucket[-1].pop()
+            if entries.get(item) == (self.minimum, len(bucket) - 1):
+                del entries[item]
+                self.size -= 1
+                return item
+            # Otherwise a stale entry left behind by update(): skip it
+
+    def isEmpty(self):
+        return self.size == 0
+
+    def contains(self, item):
+        "Returns true if 'item' is waiting in the queue"
+        return item in self.entries
+
+    __contains__ = contains
+
+    def __len__(self):
+        return self.size
+
+    def update(self, item, priority, depth=0):
+        # Same contract as PriorityQueue.update: only ever lowers a priority.
+        current = self.entries.get(item)
+        if current is None:
+            self.push(item, priority, depth)
+        elif priority < current[0]:
+            self.insert(item, priority, depth)
 
 class PriorityQueueWithFunction(PriorityQueue):
     """
@@ -641,6 +865,25 @@ class TimeoutFunction:
         return result
 
 
+def residentMemory():
+    """
+    Returns the resident memory of this process in bytes.  It is the current
+    size where /proc/self/statm exists (Linux), otherwise the peak size
+    reported by getrusage, or 0 when neither is available.
+    """
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
 
 _ORIGINAL_STDOUT = None
 _ORIGINAL_STDERR = None